@@ -7,32 +7,36 @@ Entry point for deploying modular AWS infrastructure stacks.
 import os
 from aws_cdk import App, Environment, Tags
 
-from infra.config import Config
-from infra.stacks.vpc_stack import VpcStack
-from infra.stacks.secrets_stack import SecretsStack
-from infra.stacks.rds_stack import RdsStack
-from infra.stacks.sqs_stack import SqsStack
-from infra.stacks.opensearch_stack import OpenSearchStack
-from infra.stacks.iam_stack import IamStack
+from infra.config import EnvironmentConfig
+
+# Deployment account, read once at import
+_CDK_DEFAULT_ACCOUNT = os.environ.get("CDK_DEFAULT_ACCOUNT")
 
 
 def main():
+    # Stack modules pull in large aws_cdk submodules; import them only when synthesizing
+    from infra.stacks.vpc_stack import VpcStack
+    from infra.stacks.secrets_stack import SecretsStack
+    from infra.stacks.rds_stack import RdsStack
+    from infra.stacks.sqs_stack import SqsStack
+    from infra.stacks.opensearch_stack import OpenSearchStack
+    from infra.stacks.iam_stack import IamStack
+
     app = App()
     
     # Get environment from context or default to dev
     env_name = app.node.try_get_context("env") or "dev"
-    config = Config(env_name)
+    config = EnvironmentConfig.for_env(env_name)
     
     # AWS Environment
     aws_env = Environment(
-        account=os.environ.get("CDK_DEFAULT_ACCOUNT"),
+        account=_CDK_DEFAULT_ACCOUNT,
         region=config.region
     )
     
-    # Add common tags
-    Tags.of(app).add("Environment", env_name)
-    Tags.of(app).add("Project", "aws-cdk-infra")
-    Tags.of(app).add("ManagedBy", "CDK")
+    # Add common tags (propagated to every taggable resource in the app)
+    for key, value in config.tags.items():
+        Tags.of(app).add(key, value)
     
     # Create stacks with dependencies
     vpc_stack = VpcStack(
@@ -3,11 +3,15 @@ Environment configuration module for AWS CDK infrastructure.
 Provides environment-specific settings for dev, staging, and prod deployments.
 """
 
-from dataclasses import dataclass
-from typing import Dict, Optional
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, Literal, Mapping, Optional, Tuple, get_args
 
+# Supported VPC flow log delivery targets
+FlowLogDestination = Literal["cloudwatch", "s3"]
 
-@dataclass
+
+@dataclass(frozen=True, slots=True, repr=False, eq=False)
 class EnvironmentConfig:
     """Configuration for a specific environment."""
 
@@ -24,6 +28,7 @@ class EnvironmentConfig:
     vpc_cidr: str = "10.0.0.0/16"
     enable_nat_gateway_per_az: bool = False
     enable_flow_logs: bool = True
+    flow_log_destination: FlowLogDestination = "cloudwatch"
 
     # RDS Configuration
     rds_instance_class: str = "db.serverless"
@@ -41,6 +46,8 @@ class EnvironmentConfig:
     sqs_visibility_timeout_seconds: int = 30
     sqs_message_retention_seconds: int = 1209600  # 14 days
     sqs_max_receive_count: int = 3
+    sqs_enable_fifo: bool = True
+    sqs_enable_batch: bool = True
 
     # Secrets Configuration
     secrets_rotation_days: int = 30
@@ -49,15 +56,97 @@ class EnvironmentConfig:
     enable_xray_tracing: bool = True
     enable_detailed_monitoring: bool = False
 
+    # Common tags for this environment, built once per instance (read-only)
+    tags: Mapping[str, str] = field(init=False)
+
+    # Stable name fragments and memoized outputs of the naming helpers
+    _ssm_prefix: str = field(init=False)
+    _resource_prefix: str = field(init=False)
+    _resource_suffix: str = field(init=False)
+    _resource_name_cache: Dict[Tuple[str, Optional[str]], str] = field(init=False)
+    _ssm_parameter_name_cache: Dict[Tuple[str, str], str] = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Validate settings and populate derived attributes (bypassing the frozen __setattr__)."""
+        if self.flow_log_destination not in get_args(FlowLogDestination):
+            raise ValueError(
+                f"Unknown flow log destination: {self.flow_log_destination!r}. "
+                f"Available: {list(get_args(FlowLogDestination))}"
+            )
+
+        set_attr = object.__setattr__
+        set_attr(
+            self,
+            "tags",
+            MappingProxyType(
+                {
+                    "Environment": self.name,
+                    "Project": self.project_name,
+                    "ManagedBy": "CDK",
+                }
+            ),
+        )
+        set_attr(self, "_ssm_prefix", f"/infra/{self.name}/")
+        set_attr(self, "_resource_prefix", self.project_name + "-")
+        set_attr(self, "_resource_suffix", "-" + self.name)
+        set_attr(self, "_resource_name_cache", {})
+        set_attr(self, "_ssm_parameter_name_cache", {})
+
+    @classmethod
+    def for_env(cls, env_name: str) -> "EnvironmentConfig":
+        """Return the configuration for the specified environment."""
+        try:
+            return ENVIRONMENTS[env_name]
+        except KeyError:
+            raise ValueError(
+                f"Unknown environment: {env_name}. Available: {list(_VALID_ENV_NAMES)}"
+            ) from None
+
+    @property
+    def env_name(self) -> str:
+        """Environment name (alias of ``name``)."""
+        return self.name
+
+    @property
+    def is_prod(self) -> bool:
+        """Check if this is a production environment."""
+        return self.name == "prod"
+
+    @property
+    def is_dev(self) -> bool:
+        """Check if this is a development environment."""
+        return self.name == "dev"
+
+    def get_resource_name(
+        self, resource_type: str, suffix: Optional[str] = None
+    ) -> str:
+        """Generate a standardized resource name."""
+        key = (resource_type, suffix)
+        name = self._resource_name_cache.get(key)
+        if name is None:
+            name = self._resource_prefix + resource_type + self._resource_suffix
+            if suffix:
+                name += "-" + suffix
+            self._resource_name_cache[key] = name
+        return name
+
+    def get_ssm_parameter_name(self, stack_name: str, resource_name: str) -> str:
+        """Generate SSM parameter name following the pattern: /infra/{env}/{stack}/{resource}."""
+        key = (stack_name, resource_name)
+        name = self._ssm_parameter_name_cache.get(key)
+        if name is None:
+            name = self._ssm_prefix + stack_name + "/" + resource_name
+            self._ssm_parameter_name_cache[key] = name
+        return name
 
-class Config:
-    """Main configuration class that provides environment-specific settings."""
 
-    # Environment configurations
-    ENVIRONMENTS: Dict[str, EnvironmentConfig] = {
+# Environment configurations (read-only)
+ENVIRONMENTS: Mapping[str, EnvironmentConfig] = MappingProxyType(
+    {
         "dev": EnvironmentConfig(
             name="dev",
             enable_nat_gateway_per_az=False,
+            flow_log_destination="s3",
             rds_min_capacity=0.5,
             rds_max_capacity=2.0,
             rds_backup_retention_days=7,
@@ -65,6 +154,8 @@ class Config:
             opensearch_instance_type="t3.small.search",
             opensearch_instance_count=1,
             opensearch_ebs_volume_size=20,
+            sqs_enable_fifo=False,
+            sqs_enable_batch=False,
             enable_detailed_monitoring=False,
         ),
         "staging": EnvironmentConfig(
@@ -92,73 +183,5 @@ class Config:
             enable_detailed_monitoring=True,
         ),
     }
-
-    env_name: str
-    env_config: EnvironmentConfig
-
-    # Commonly accessed attributes exposed directly on the config
-    region: str
-    project_name: str
-    vpc_cidr: str
-    enable_nat_gateway_per_az: bool
-    enable_flow_logs: bool
-    rds_instance_class: str
-    rds_min_capacity: float
-    rds_max_capacity: float
-    rds_backup_retention_days: int
-    rds_multi_az: bool
-    opensearch_instance_type: str
-    opensearch_instance_count: int
-    opensearch_ebs_volume_size: int
-    sqs_visibility_timeout_seconds: int
-    sqs_message_retention_seconds: int
-    sqs_max_receive_count: int
-    secrets_rotation_days: int
-    enable_xray_tracing: bool
-    enable_detailed_monitoring: bool
-
-    def __init__(self, env_name: str):
-        """Initialize configuration for the specified environment."""
-        if env_name not in self.ENVIRONMENTS:
-            raise ValueError(
-                f"Unknown environment: {env_name}. Available: {list(self.ENVIRONMENTS.keys())}"
-            )
-
-        self.env_name = env_name
-        self.env_config = self.ENVIRONMENTS[env_name]
-
-        # Set attributes for easy access
-        for field_name, field_value in self.env_config.__dict__.items():
-            setattr(self, field_name, field_value)
-
-    @property
-    def is_prod(self) -> bool:
-        """Check if this is a production environment."""
-        return self.env_name == "prod"
-
-    @property
-    def is_dev(self) -> bool:
-        """Check if this is a development environment."""
-        return self.env_name == "dev"
-
-    @property
-    def tags(self) -> Dict[str, str]:
-        """Get common tags for this environment."""
-        return {
-            "Environment": self.env_name,
-            "Project": self.project_name,
-            "ManagedBy": "CDK",
-        }
-
-    def get_resource_name(
-        self, resource_type: str, suffix: Optional[str] = None
-    ) -> str:
-        """Generate a standardized resource name."""
-        name_parts = [self.project_name, resource_type, self.env_name]
-        if suffix:
-            name_parts.append(suffix)
-        return "-".join(name_parts)
-
-    def get_ssm_parameter_name(self, stack_name: str, resource_name: str) -> str:
-        """Generate SSM parameter name following the pattern: /infra/{env}/{stack}/{resource}."""
-        return f"/infra/{self.env_name}/{stack_name}/{resource_name}"
+)
+_VALID_ENV_NAMES: Tuple[str, ...] = tuple(ENVIRONMENTS)
@@ -3,7 +3,8 @@ Constants for AWS CDK infrastructure project.
 Centralizes magic numbers and configuration values.
 """
 
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Mapping
 
 
 class Constants:
@@ -19,12 +20,17 @@ class Constants:
     BATCH_QUEUE_VISIBILITY_TIMEOUT = 300  # 5 minutes
     DEFAULT_VISIBILITY_TIMEOUT = 30  # 30 seconds
     MESSAGE_RETENTION_SECONDS = 1209600  # 14 days
+    SQS_DATA_KEY_REUSE_SECONDS = 86400  # 24 hours (SQS maximum)
 
     # Backup Constants
     DEV_BACKUP_RETENTION_DAYS = 7
     STAGING_BACKUP_RETENTION_DAYS = 14
     PROD_BACKUP_RETENTION_DAYS = 30
 
+    # Flow Log Constants (S3 destination lifecycle)
+    DEV_FLOW_LOG_RETENTION_DAYS = 7
+    FLOW_LOG_RETENTION_DAYS = 90
+
     # Rotation Constants
     SECRETS_ROTATION_DAYS = 30
 
@@ -53,39 +59,48 @@ class Constants:
     # Snapshot Constants
     AUTOMATED_SNAPSHOT_START_HOUR = 3  # UTC
     AUTOMATED_SNAPSHOT_START_MINUTE = 0
+    BACKUP_PREFERRED_WINDOW = f"{AUTOMATED_SNAPSHOT_START_HOUR:02d}:00-{AUTOMATED_SNAPSHOT_START_HOUR + 1:02d}:00"  # UTC
 
     # Aurora Parameter Constants
-    AURORA_PARAMETERS: Dict[str, str] = {
-        "innodb_buffer_pool_size": "{DBInstanceClassMemory*3/4}",
-        "max_connections": "1000",
-        "slow_query_log": "1",
-        "long_query_time": "2",
-    }
+    AURORA_PARAMETERS: Mapping[str, str] = MappingProxyType(
+        {
+            "innodb_buffer_pool_size": "{DBInstanceClassMemory*3/4}",
+            "max_connections": "1000",
+            "slow_query_log": "1",
+            "long_query_time": "2",
+        }
+    )
 
     # OpenSearch Advanced Options
-    OPENSEARCH_ADVANCED_OPTIONS: Dict[str, str] = {
-        "rest.action.multi.allow_explicit_index": "true",
-        "indices.fielddata.cache.size": "20%",
-        "indices.query.bool.max_clause_count": "1024",
-    }
+    OPENSEARCH_ADVANCED_OPTIONS: Mapping[str, str] = MappingProxyType(
+        {
+            "rest.action.multi.allow_explicit_index": "true",
+            "indices.fielddata.cache.size": "20%",
+            "indices.query.bool.max_clause_count": "1024",
+        }
+    )
 
     # Resource Name Constants
     DEFAULT_DATABASE_NAME = "appdb"
     DEFAULT_MASTER_USERNAME = "admin"
 
     # Tag Constants
-    COMMON_TAGS: Dict[str, str] = {
-        "ManagedBy": "CDK",
-        "Project": "aws-cdk-infra",
-    }
+    COMMON_TAGS: Mapping[str, str] = MappingProxyType(
+        {
+            "ManagedBy": "CDK",
+            "Project": "aws-cdk-infra",
+        }
+    )
 
     # Purpose Tags
-    PURPOSE_TAGS: Dict[str, str] = {
-        "SSM_PARAMETER_ENCRYPTION": "SSMParameterEncryption",
-        "RDS_ENCRYPTION": "RdsEncryption",
-        "SQS_ENCRYPTION": "SqsEncryption",
-        "OPENSEARCH_ENCRYPTION": "OpenSearchEncryption",
-        "SECRETS_ENCRYPTION": "SecretsEncryption",
-        "VPC_FLOW_LOGS": "VpcFlowLogs",
-        "OPENSEARCH_LOGS": "OpenSearchLogs",
-    }
+    PURPOSE_TAGS: Mapping[str, str] = MappingProxyType(
+        {
+            "SSM_PARAMETER_ENCRYPTION": "SSMParameterEncryption",
+            "RDS_ENCRYPTION": "RdsEncryption",
+            "SQS_ENCRYPTION": "SqsEncryption",
+            "OPENSEARCH_ENCRYPTION": "OpenSearchEncryption",
+            "SECRETS_ENCRYPTION": "SecretsEncryption",
+            "VPC_FLOW_LOGS": "VpcFlowLogs",
+            "OPENSEARCH_LOGS": "OpenSearchLogs",
+        }
+    )
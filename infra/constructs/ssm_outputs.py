@@ -3,7 +3,9 @@ SSM Parameter Store helper construct for standardized output publishing.
 Provides utilities for creating SSM parameters and CloudFormation outputs.
 """
 
-from typing import Any, Dict, Optional, Union, List
+import json
+from functools import cached_property, lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
 from aws_cdk import (
     Stack,
     CfnOutput,
@@ -13,7 +15,16 @@ from aws_cdk import (
 )
 from constructs import Construct
 
-from infra.config import Config
+from infra.config import EnvironmentConfig
+
+# Characters stripped from resource names when deriving construct IDs
+_SANITIZE_TABLE = str.maketrans("", "", "-_")
+
+
+@lru_cache(maxsize=256)
+def _construct_id(name: str) -> str:
+    """Derive a title-cased construct ID fragment from a resource name."""
+    return name.translate(_SANITIZE_TABLE).title()
 
 
 class SsmOutputs(Construct):
@@ -23,7 +34,7 @@ class SsmOutputs(Construct):
         self,
         scope: Construct,
         construct_id: str,
-        config: Config,
+        config: EnvironmentConfig,
         stack_name: str,
         description: Optional[str] = None,
         kms_key: Optional[kms.IKey] = None,
@@ -34,23 +45,27 @@ class SsmOutputs(Construct):
         self.stack_name = stack_name
         self.description = description or f"SSM parameters for {stack_name}"
 
-        self.kms_key: kms.IKey
-        if kms_key is None:
-            # Create dedicated KMS key for SSM parameter encryption
-            self.kms_key = kms.Key(
-                self,
-                "SsmKmsKey",
-                description=f"KMS key for SSM parameters in {stack_name}",
-                enable_key_rotation=True,
-            )
-
-            # Add tags
-            Tags.of(self.kms_key).add("Purpose", "SSMParameterEncryption")
-            for key, value in self.config.tags.items():
-                Tags.of(self.kms_key).add(key, value)
-        else:
+        # Provided key is reused as-is; otherwise one is created on first use
+        self._kms_key = kms_key
+
+    @cached_property
+    def kms_key(self) -> kms.IKey:
+        """KMS key for SSM parameter encryption, created lazily when none was provided."""
+        if self._kms_key is not None:
             # Reuse provided KMS key (tags assumed to be managed by caller)
-            self.kms_key = kms_key
+            return self._kms_key
+
+        # Create dedicated KMS key for SSM parameter encryption
+        kms_key = kms.Key(
+            self,
+            "SsmKmsKey",
+            description=f"KMS key for SSM parameters in {self.stack_name}",
+            enable_key_rotation=True,
+        )
+
+        # Common tags are inherited from the app scope
+        Tags.of(kms_key).add("Purpose", "SSMParameterEncryption")
+        return kms_key
 
     def create_parameter(
         self,
@@ -68,7 +83,7 @@ class SsmOutputs(Construct):
 
         param = ssm.StringParameter(
             self,
-            f"Parameter{parameter_name.replace('-', '').replace('_', '').title()}",
+            f"Parameter{_construct_id(parameter_name)}",
             parameter_name=full_parameter_name,
             string_value=str(value),
             description=description or f"{parameter_name} for {self.stack_name}",
@@ -76,10 +91,6 @@ class SsmOutputs(Construct):
             tier=tier,
         )
 
-        # Add tags
-        for key, value in self.config.tags.items():
-            Tags.of(param).add(key, value)
-
         return param
 
     def create_output(
@@ -120,7 +131,7 @@ class SsmOutputs(Construct):
 
         # Create CloudFormation output
         output = self.create_output(
-            f"{resource_name.replace('-', '').replace('_', '').title()}Output",
+            f"{_construct_id(resource_name)}Output",
             value,
             description,
         )
@@ -132,6 +143,33 @@ class SsmOutputs(Construct):
             "value": value,
         }
 
+    def create_parameters_bulk(
+        self,
+        parameters: Mapping[str, Tuple[Union[str, int, float, bool], Optional[str]]],
+    ) -> Dict[str, Dict[str, Any]]:
+        """Create SSM parameters and CloudFormation outputs from a name -> (value, description) mapping."""
+
+        create = self.create_parameter_and_output
+        return {
+            resource_name: create(resource_name, value, description)
+            for resource_name, (value, description) in parameters.items()
+        }
+
+    def create_aggregated_parameter(
+        self,
+        parameter_name: str,
+        values: Mapping[str, str],
+        description: Optional[str] = None,
+    ) -> ssm.StringParameter:
+        """Create a single SSM parameter holding the values as a JSON object."""
+
+        # Tokens inside the values are rendered as a CloudFormation join
+        return self.create_parameter(
+            parameter_name,
+            Stack.of(self).to_json_string(dict(values)),
+            description or f"{self.stack_name} outputs (JSON)",
+        )
+
     def create_string_list_parameter(
         self,
         parameter_name: str,
@@ -146,16 +184,12 @@ class SsmOutputs(Construct):
 
         param = ssm.StringListParameter(
             self,
-            f"Parameter{parameter_name.replace('-', '').replace('_', '').title()}",
+            f"Parameter{_construct_id(parameter_name)}",
             parameter_name=full_parameter_name,
             string_list_value=[str(v) for v in values],
             description=description or f"{parameter_name} for {self.stack_name}",
         )
 
-        # Add tags
-        for key, value in self.config.tags.items():
-            Tags.of(param).add(key, value)
-
         return param
 
     def create_secure_string_parameter(
@@ -164,7 +198,11 @@ class SsmOutputs(Construct):
         value: str,
         description: Optional[str] = None,
     ) -> ssm.StringParameter:
-        """Create an SSM SecureString parameter."""
+        """Create an SSM SecureString parameter.
+
+        CloudFormation cannot attach a customer managed key to an SSM parameter,
+        so this does not create or use ``kms_key``.
+        """
 
         return self.create_parameter(
             parameter_name,
@@ -175,7 +213,7 @@ class SsmOutputs(Construct):
 
 
 def get_parameter_value(
-    config: Config,
+    config: EnvironmentConfig,
     stack_name: str,
     resource_name: str,
     default_value: Optional[str] = None,
@@ -198,3 +236,12 @@ def get_parameter_value(
         raise ValueError(
             f"Parameter {parameter_name} not found and no default provided"
         )
+
+
+def get_aggregated_parameter_values(
+    config: EnvironmentConfig,
+    stack_name: str,
+    resource_name: str = "outputs",
+) -> Dict[str, str]:
+    """Helper function to retrieve and decode an aggregated JSON SSM parameter."""
+    return json.loads(get_parameter_value(config, stack_name, resource_name))
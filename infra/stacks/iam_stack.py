@@ -5,8 +5,8 @@ IAM Stack - Creates IAM roles and policies with least-privilege access.
 from aws_cdk import (
     Stack,
     aws_iam as iam,
-    Tags,
 )
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -16,10 +16,55 @@ if TYPE_CHECKING:
 
 from constructs import Construct
 
-from infra.config import Config
+from infra.config import EnvironmentConfig
 from infra.constructs.ssm_outputs import SsmOutputs
 
 
+@lru_cache(maxsize=None)
+def _managed_policy(name: str) -> iam.IManagedPolicy:
+    """Return a shared AWS managed policy reference (its ARN resolves per consuming stack)."""
+    return iam.ManagedPolicy.from_aws_managed_policy_name(name)
+
+
+# Policy actions granted by the IAM stack
+_RDS_DESCRIBE_ACTIONS = (
+    "rds:DescribeDBClusters",
+    "rds:DescribeDBInstances",
+    "rds:DescribeDBClusterEndpoints",
+)
+_SECRET_READ_ACTIONS = (
+    "secretsmanager:GetSecretValue",
+    "secretsmanager:DescribeSecret",
+)
+_SQS_ACCESS_ACTIONS = (
+    "sqs:SendMessage",
+    "sqs:SendMessageBatch",
+    "sqs:ReceiveMessage",
+    "sqs:DeleteMessage",
+    "sqs:DeleteMessageBatch",
+    "sqs:GetQueueAttributes",
+    "sqs:GetQueueUrl",
+)
+_OPENSEARCH_HTTP_ACTIONS = (
+    "es:ESHttpGet",
+    "es:ESHttpPost",
+    "es:ESHttpPut",
+    "es:ESHttpDelete",
+    "es:ESHttpHead",
+)
+_OPENSEARCH_DESCRIBE_ACTIONS = (
+    "es:DescribeDomain",
+    "es:DescribeDomains",
+)
+_CLOUDWATCH_LOGS_ACTIONS = (
+    "logs:CreateLogGroup",
+    "logs:CreateLogStream",
+    "logs:PutLogEvents",
+    "logs:DescribeLogGroups",
+    "logs:DescribeLogStreams",
+)
+
+
 class IamStack(Stack):
     """IAM stack with least-privilege roles and policies."""
 
@@ -27,7 +72,7 @@ class IamStack(Stack):
         self,
         scope: Construct,
         construct_id: str,
-        config: Config,
+        config: EnvironmentConfig,
         rds_stack: "RdsStack",
         sqs_stack: "SqsStack",
         opensearch_stack: "OpenSearchStack",
@@ -49,6 +94,27 @@ class IamStack(Stack):
     def _create_roles_and_policies(self):
         """Create IAM roles and policies with least-privilege access."""
 
+        # Resolve dependency ARNs once
+        secrets = self.rds_stack.secrets_stack
+        sqs = self.sqs_stack
+        # FIFO and batch queues are optional per environment
+        queue_arns = [
+            queue.queue_arn
+            for queue in (
+                sqs.main_queue,
+                sqs.high_priority_queue,
+                sqs.fifo_queue,
+                sqs.batch_queue,
+                sqs.dlq,
+            )
+            if queue is not None
+        ]
+        app_secret_arns = [
+            secrets.api_keys.secret_arn,
+            secrets.app_config.secret_arn,
+            secrets.db_connection_strings.secret_arn,
+        ]
+
         # Lambda execution role
         self.lambda_execution_role = iam.Role(
             self,
@@ -57,12 +123,8 @@ class IamStack(Stack):
             assumed_by=iam.ServicePrincipal("lambda.amazonaws.com"),
             description="Execution role for Lambda functions",
             managed_policies=[
-                iam.ManagedPolicy.from_aws_managed_policy_name(
-                    "service-role/AWSLambdaBasicExecutionRole"
-                ),
-                iam.ManagedPolicy.from_aws_managed_policy_name(
-                    "service-role/AWSLambdaVPCAccessExecutionRole"
-                ),
+                _managed_policy("service-role/AWSLambdaBasicExecutionRole"),
+                _managed_policy("service-role/AWSLambdaVPCAccessExecutionRole"),
             ],
         )
 
@@ -78,60 +140,6 @@ class IamStack(Stack):
             description="Role for application services",
         )
 
-        # RDS access policy
-        self.rds_access_policy = iam.Policy(
-            self,
-            "RdsAccessPolicy",
-            policy_name=self.config.get_resource_name("rds-access-policy"),
-            statements=[
-                iam.PolicyStatement(
-                    effect=iam.Effect.ALLOW,
-                    actions=[
-                        "rds:DescribeDBClusters",
-                        "rds:DescribeDBInstances",
-                        "rds:DescribeDBClusterEndpoints",
-                    ],
-                    resources=["*"],
-                ),
-                iam.PolicyStatement(
-                    effect=iam.Effect.ALLOW,
-                    actions=[
-                        "secretsmanager:GetSecretValue",
-                        "secretsmanager:DescribeSecret",
-                    ],
-                    resources=[self.rds_stack.secrets_stack.rds_credentials.secret_arn],
-                ),
-            ],
-        )
-
-        # SQS access policy
-        self.sqs_access_policy = iam.Policy(
-            self,
-            "SqsAccessPolicy",
-            policy_name=self.config.get_resource_name("sqs-access-policy"),
-            statements=[
-                iam.PolicyStatement(
-                    effect=iam.Effect.ALLOW,
-                    actions=[
-                        "sqs:SendMessage",
-                        "sqs:SendMessageBatch",
-                        "sqs:ReceiveMessage",
-                        "sqs:DeleteMessage",
-                        "sqs:DeleteMessageBatch",
-                        "sqs:GetQueueAttributes",
-                        "sqs:GetQueueUrl",
-                    ],
-                    resources=[
-                        self.sqs_stack.main_queue.queue_arn,
-                        self.sqs_stack.high_priority_queue.queue_arn,
-                        self.sqs_stack.fifo_queue.queue_arn,
-                        self.sqs_stack.batch_queue.queue_arn,
-                        self.sqs_stack.dlq.queue_arn,
-                    ],
-                ),
-            ],
-        )
-
         opensearch_domain_arn = getattr(self.opensearch_stack, "domain_arn", None)
         if not opensearch_domain_arn and getattr(self.opensearch_stack, "domain", None):
             opensearch_domain_arn = getattr(
@@ -143,103 +151,71 @@ class IamStack(Stack):
                 "OpenSearch domain ARN is not available from the provided stack"
             )
 
-        # OpenSearch access policy
-        self.opensearch_access_policy = iam.Policy(
-            self,
-            "OpenSearchAccessPolicy",
-            policy_name=self.config.get_resource_name("opensearch-access-policy"),
-            statements=[
-                iam.PolicyStatement(
-                    effect=iam.Effect.ALLOW,
-                    actions=[
-                        "es:ESHttpGet",
-                        "es:ESHttpPost",
-                        "es:ESHttpPut",
-                        "es:ESHttpDelete",
-                        "es:ESHttpHead",
-                    ],
-                    resources=[f"{opensearch_domain_arn}/*"],
-                ),
-                iam.PolicyStatement(
-                    effect=iam.Effect.ALLOW,
-                    actions=[
-                        "es:DescribeDomain",
-                        "es:DescribeDomains",
-                    ],
-                    resources=[opensearch_domain_arn],
+        # Policy table: (construct id, resource name, [(actions, resources), ...])
+        policy_specs = (
+            (
+                "RdsAccessPolicy",
+                "rds-access-policy",
+                (
+                    (_RDS_DESCRIBE_ACTIONS, ["*"]),
+                    (_SECRET_READ_ACTIONS, [secrets.rds_credentials.secret_arn]),
                 ),
-            ],
-        )
-
-        # Secrets Manager access policy
-        self.secrets_access_policy = iam.Policy(
-            self,
-            "SecretsAccessPolicy",
-            policy_name=self.config.get_resource_name("secrets-access-policy"),
-            statements=[
-                iam.PolicyStatement(
-                    effect=iam.Effect.ALLOW,
-                    actions=[
-                        "secretsmanager:GetSecretValue",
-                        "secretsmanager:DescribeSecret",
-                    ],
-                    resources=[
-                        self.rds_stack.secrets_stack.api_keys.secret_arn,
-                        self.rds_stack.secrets_stack.app_config.secret_arn,
-                        self.rds_stack.secrets_stack.db_connection_strings.secret_arn,
-                    ],
-                ),
-            ],
-        )
-
-        # CloudWatch logs policy
-        self.cloudwatch_logs_policy = iam.Policy(
-            self,
-            "CloudWatchLogsPolicy",
-            policy_name=self.config.get_resource_name("cloudwatch-logs-policy"),
-            statements=[
-                iam.PolicyStatement(
-                    effect=iam.Effect.ALLOW,
-                    actions=[
-                        "logs:CreateLogGroup",
-                        "logs:CreateLogStream",
-                        "logs:PutLogEvents",
-                        "logs:DescribeLogGroups",
-                        "logs:DescribeLogStreams",
-                    ],
-                    resources=["*"],
+            ),
+            (
+                "SqsAccessPolicy",
+                "sqs-access-policy",
+                ((_SQS_ACCESS_ACTIONS, queue_arns),),
+            ),
+            (
+                "OpenSearchAccessPolicy",
+                "opensearch-access-policy",
+                (
+                    (_OPENSEARCH_HTTP_ACTIONS, [f"{opensearch_domain_arn}/*"]),
+                    (_OPENSEARCH_DESCRIBE_ACTIONS, [opensearch_domain_arn]),
                 ),
-            ],
+            ),
+            (
+                "SecretsAccessPolicy",
+                "secrets-access-policy",
+                ((_SECRET_READ_ACTIONS, app_secret_arns),),
+            ),
+            (
+                "CloudWatchLogsPolicy",
+                "cloudwatch-logs-policy",
+                ((_CLOUDWATCH_LOGS_ACTIONS, ["*"]),),
+            ),
         )
 
-        # Attach policies to roles
-        self.lambda_execution_role.attach_inline_policy(self.rds_access_policy)
-        self.lambda_execution_role.attach_inline_policy(self.sqs_access_policy)
-        self.lambda_execution_role.attach_inline_policy(self.opensearch_access_policy)
-        self.lambda_execution_role.attach_inline_policy(self.secrets_access_policy)
-        self.lambda_execution_role.attach_inline_policy(self.cloudwatch_logs_policy)
-
-        self.application_role.attach_inline_policy(self.rds_access_policy)
-        self.application_role.attach_inline_policy(self.sqs_access_policy)
-        self.application_role.attach_inline_policy(self.opensearch_access_policy)
-        self.application_role.attach_inline_policy(self.secrets_access_policy)
-        self.application_role.attach_inline_policy(self.cloudwatch_logs_policy)
-
-        # Add tags to all IAM resources
-        for resource in [
-            self.lambda_execution_role,
-            self.application_role,
-            self.rds_access_policy,
-            self.sqs_access_policy,
-            self.opensearch_access_policy,
-            self.secrets_access_policy,
-            self.cloudwatch_logs_policy,
-        ]:
-            for key, value in self.config.tags.items():
-                Tags.of(resource).add(key, value)
+        # Policies keyed by resource name, in table order
+        self._policies = {
+            name: iam.Policy(
+                self,
+                construct_id,
+                policy_name=self.config.get_resource_name(name),
+                statements=[
+                    iam.PolicyStatement(
+                        effect=iam.Effect.ALLOW,
+                        actions=list(actions),
+                        resources=resources,
+                    )
+                    for actions, resources in statements
+                ],
+            )
+            for construct_id, name, statements in policy_specs
+        }
+        self.rds_access_policy = self._policies["rds-access-policy"]
+        self.sqs_access_policy = self._policies["sqs-access-policy"]
+        self.opensearch_access_policy = self._policies["opensearch-access-policy"]
+        self.secrets_access_policy = self._policies["secrets-access-policy"]
+        self.cloudwatch_logs_policy = self._policies["cloudwatch-logs-policy"]
+
+        # Attach policies to roles (common tags are inherited from the app scope)
+        for role in (self.lambda_execution_role, self.application_role):
+            for policy in self._policies.values():
+                role.attach_inline_policy(policy)
 
     def _create_outputs(self):
-        """Create SSM parameters and CloudFormation outputs."""
+        """Create SSM parameters (IAM references are not exported as stack outputs)."""
 
         ssm_outputs = SsmOutputs(
             self,
@@ -249,57 +225,57 @@ class IamStack(Stack):
         )
 
         # Role ARNs
-        ssm_outputs.create_parameter_and_output(
+        ssm_outputs.create_parameter(
             "lambda-execution-role-arn",
             self.lambda_execution_role.role_arn,
             "Lambda execution role ARN",
         )
 
-        ssm_outputs.create_parameter_and_output(
+        ssm_outputs.create_parameter(
             "application-role-arn",
             self.application_role.role_arn,
             "Application role ARN",
         )
 
         # Policy names (inline policies don't have ARNs)
-        ssm_outputs.create_parameter_and_output(
+        ssm_outputs.create_parameter(
             "rds-access-policy-name",
             self.rds_access_policy.policy_name,
             "RDS access policy name",
         )
 
-        ssm_outputs.create_parameter_and_output(
+        ssm_outputs.create_parameter(
             "sqs-access-policy-name",
             self.sqs_access_policy.policy_name,
             "SQS access policy name",
         )
 
-        ssm_outputs.create_parameter_and_output(
+        ssm_outputs.create_parameter(
             "opensearch-access-policy-name",
             self.opensearch_access_policy.policy_name,
             "OpenSearch access policy name",
         )
 
-        ssm_outputs.create_parameter_and_output(
+        ssm_outputs.create_parameter(
             "secrets-access-policy-name",
             self.secrets_access_policy.policy_name,
             "Secrets access policy name",
         )
 
-        ssm_outputs.create_parameter_and_output(
+        ssm_outputs.create_parameter(
             "cloudwatch-logs-policy-name",
             self.cloudwatch_logs_policy.policy_name,
             "CloudWatch logs policy name",
         )
 
         # Role names (for applications to reference)
-        ssm_outputs.create_parameter_and_output(
+        ssm_outputs.create_parameter(
             "lambda-execution-role-name",
             self.lambda_execution_role.role_name,
             "Lambda execution role name",
         )
 
-        ssm_outputs.create_parameter_and_output(
+        ssm_outputs.create_parameter(
             "application-role-name",
             self.application_role.role_name,
             "Application role name",
@@ -4,10 +4,11 @@ OpenSearch Stack - Creates OpenSearch domain with VPC configuration.
 
 from aws_cdk import (
     Stack,
-    CfnResource,
     aws_ec2 as ec2,
+    aws_iam as iam,
     aws_kms as kms,
     aws_logs as logs,
+    aws_opensearchservice as opensearch,
     aws_secretsmanager as secretsmanager,
     RemovalPolicy,
     Tags,
@@ -19,7 +20,7 @@ if TYPE_CHECKING:
 
 from constructs import Construct
 
-from infra.config import Config
+from infra.config import EnvironmentConfig
 from infra.constructs.ssm_outputs import SsmOutputs
 from infra.constants import Constants
 
@@ -31,7 +32,7 @@ class OpenSearchStack(Stack):
         self,
         scope: Construct,
         construct_id: str,
-        config: Config,
+        config: EnvironmentConfig,
         vpc_stack: "VpcStack",
         **kwargs,
     ):
@@ -40,7 +41,8 @@ class OpenSearchStack(Stack):
         self.config = config
         self.vpc_stack = vpc_stack
 
-        # Create KMS key for OpenSearch encryption
+        # Stack-local KMS key (moving the encrypted storage to another key
+        # forces its replacement, so this key is not shared)
         self.kms_key = kms.Key(
             self,
             "OpenSearchKmsKey",
@@ -50,8 +52,6 @@ class OpenSearchStack(Stack):
 
         # Add tags to KMS key
         Tags.of(self.kms_key).add("Purpose", "OpenSearchEncryption")
-        for key, value in self.config.tags.items():
-            Tags.of(self.kms_key).add(key, value)
 
         # Create OpenSearch domain
         self._create_opensearch_domain()
@@ -78,94 +78,87 @@ class OpenSearchStack(Stack):
         Tags.of(self.log_group).add(
             "Purpose", Constants.PURPOSE_TAGS["OPENSEARCH_LOGS"]
         )
-        for key, value in self.config.tags.items():
-            Tags.of(self.log_group).add(key, value)
+
+        # Let OpenSearch publish to the log group (native policy, no custom resource)
+        self.log_group_policy = self.log_group.add_to_resource_policy(
+            iam.PolicyStatement(
+                principals=[iam.ServicePrincipal("es.amazonaws.com")],
+                actions=["logs:CreateLogStream", "logs:PutLogEvents"],
+                resources=[self.log_group.log_group_arn],
+            )
+        ).policy_dependable
 
         # Create master password secret
         self.master_password_secret = self._create_master_password_secret()
 
-        subnet_ids = self.vpc_stack.vpc.select_subnets(
-            subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS,
-        ).subnet_ids
-
-        cluster_config = {
-            "InstanceCount": self.config.opensearch_instance_count,
-            "InstanceType": self.config.opensearch_instance_type,
-        }
-        if self.config.opensearch_instance_count > 1:
-            cluster_config["ZoneAwarenessEnabled"] = True
-            cluster_config["ZoneAwarenessConfig"] = {
-                "AvailabilityZoneCount": max(
-                    2, min(3, self.config.opensearch_instance_count)
-                ),
-            }
-        if self.config.is_prod:
-            cluster_config["MultiAZWithStandbyEnabled"] = True
+        # Domain names are limited to 28 characters, so use the short "search" type
+        domain_name = self.config.get_resource_name("search")
+        instance_count = self.config.opensearch_instance_count
 
-        domain_tags = [
-            {"Key": "Name", "Value": self.config.get_resource_name("opensearch")},
-        ]
-        domain_tags.extend(
-            {"Key": key, "Value": value} for key, value in self.config.tags.items()
+        # One private subnet per availability zone the domain spans
+        private_subnets = self.vpc_stack.private_with_egress_subnets
+        zone_count = (
+            max(2, min(3, instance_count, len(private_subnets)))
+            if instance_count > 1
+            else 1
         )
 
-        self.domain = CfnResource(
+        self.domain = opensearch.Domain(
             self,
             "OpenSearchDomain",
-            type="AWS::OpenSearch::Domain",
-            properties={
-                "DomainName": self.config.get_resource_name("opensearch"),
-                "EngineVersion": "OpenSearch_2.11",
-                "ClusterConfig": cluster_config,
-                "EBSOptions": {
-                    "EBSEnabled": True,
-                    "VolumeSize": self.config.opensearch_ebs_volume_size,
-                    "VolumeType": "gp3",
-                },
-                "EncryptionAtRestOptions": {
-                    "Enabled": True,
-                    "KmsKeyId": self.kms_key.key_arn,
-                },
-                "NodeToNodeEncryptionOptions": {
-                    "Enabled": True,
-                },
-                "AdvancedSecurityOptions": {
-                    "Enabled": True,
-                    "InternalUserDatabaseEnabled": True,
-                    "MasterUserOptions": {
-                        "MasterUserName": Constants.DEFAULT_MASTER_USERNAME,
-                        "MasterUserPassword": self.master_password_secret.secret_value_from_json(
-                            "password"
-                        ).unsafe_unwrap(),
-                    },
-                },
-                "DomainEndpointOptions": {
-                    "EnforceHTTPS": True,
-                    "TLSSecurityPolicy": "Policy-Min-TLS-1-2-2019-07",
-                },
-                "VPCOptions": {
-                    "SubnetIds": subnet_ids,
-                    "SecurityGroupIds": [
-                        self.vpc_stack.opensearch_security_group.security_group_id,
-                    ],
-                },
-                "LogPublishingOptions": {
-                    "ES_APPLICATION_LOGS": {
-                        "CloudWatchLogsLogGroupArn": self.log_group.log_group_arn,
-                        "Enabled": True,
-                    },
-                },
-                "AdvancedOptions": Constants.OPENSEARCH_ADVANCED_OPTIONS,
-                "Tags": domain_tags,
-            },
-        )
-        self.domain.apply_removal_policy(
-            RemovalPolicy.DESTROY if self.config.is_dev else RemovalPolicy.RETAIN
+            domain_name=domain_name,
+            version=opensearch.EngineVersion.OPENSEARCH_2_11,
+            capacity=opensearch.CapacityConfig(
+                data_nodes=instance_count,
+                data_node_instance_type=self.config.opensearch_instance_type,
+                multi_az_with_standby_enabled=self.config.is_prod,
+            ),
+            zone_awareness=(
+                opensearch.ZoneAwarenessConfig(
+                    enabled=True,
+                    availability_zone_count=zone_count,
+                )
+                if instance_count > 1
+                else None
+            ),
+            ebs=opensearch.EbsOptions(
+                enabled=True,
+                volume_size=self.config.opensearch_ebs_volume_size,
+                volume_type=ec2.EbsDeviceVolumeType.GP3,
+            ),
+            encryption_at_rest=opensearch.EncryptionAtRestOptions(
+                enabled=True,
+                kms_key=self.kms_key,
+            ),
+            node_to_node_encryption=True,
+            fine_grained_access_control=opensearch.AdvancedSecurityOptions(
+                master_user_name=Constants.DEFAULT_MASTER_USERNAME,
+                master_user_password=self.master_password_secret.secret_value_from_json(
+                    "password"
+                ),
+            ),
+            enforce_https=True,
+            tls_security_policy=opensearch.TLSSecurityPolicy.TLS_1_2,
+            vpc=self.vpc_stack.vpc,
+            vpc_subnets=[ec2.SubnetSelection(subnets=private_subnets[:zone_count])],
+            security_groups=[self.vpc_stack.opensearch_security_group],
+            logging=opensearch.LoggingOptions(
+                app_log_enabled=True,
+                app_log_group=self.log_group,
+            ),
+            suppress_logs_resource_policy=True,
+            advanced_options=dict(Constants.OPENSEARCH_ADVANCED_OPTIONS),
+            removal_policy=(
+                RemovalPolicy.DESTROY if self.config.is_dev else RemovalPolicy.RETAIN
+            ),
         )
+        if self.log_group_policy:
+            self.domain.node.add_dependency(self.log_group_policy)
+        Tags.of(self.domain).add("Name", domain_name)
 
-        self.domain_endpoint = self.domain.get_att("DomainEndpoint").to_string()
-        self.domain_arn = self.domain.get_att("Arn").to_string()
-        self.domain_name = self.config.get_resource_name("opensearch")
+        self.domain_endpoint = self.domain.domain_endpoint
+        self.domain_arn = self.domain.domain_arn
+        self.domain_name = domain_name
 
     def _create_master_password_secret(self):
         """Create a secure master password secret for OpenSearch."""
@@ -185,14 +178,10 @@ class OpenSearchStack(Stack):
             encryption_key=self.kms_key,
         )
 
-        # Add tags to secret
-        for key, value in self.config.tags.items():
-            Tags.of(master_password_secret).add(key, value)
-
         return master_password_secret
 
     def _create_outputs(self):
-        """Create SSM parameters and CloudFormation outputs."""
+        """Create a single aggregated SSM parameter with the domain outputs."""
 
         ssm_outputs = SsmOutputs(
             self,
@@ -202,66 +191,19 @@ class OpenSearchStack(Stack):
             kms_key=self.kms_key,
         )
 
-        # Domain endpoint
-        ssm_outputs.create_parameter_and_output(
-            "domain-endpoint",
-            self.domain_endpoint,
-            "OpenSearch domain endpoint",
-        )
-
-        # Domain ARN
-        ssm_outputs.create_parameter_and_output(
-            "domain-arn",
-            self.domain_arn,
-            "OpenSearch domain ARN",
-        )
-
-        # Domain name
-        ssm_outputs.create_parameter_and_output(
-            "domain-name",
-            self.domain_name,
-            "OpenSearch domain name",
-        )
-
-        # Kibana endpoint
-        # Note: Kibana endpoint is the same as domain endpoint for OpenSearch
-        # ssm_outputs.create_parameter_and_output(
-        #     "kibana-endpoint",
-        #     self.domain_endpoint,
-        #     "Kibana endpoint",
-        # )
-
-        # KMS key ARN
-        ssm_outputs.create_parameter_and_output(
-            "kms-key-arn",
-            self.kms_key.key_arn,
-            "OpenSearch KMS key ARN",
-        )
-
-        # Log group ARN
-        ssm_outputs.create_parameter_and_output(
-            "log-group-arn",
-            self.log_group.log_group_arn,
-            "OpenSearch log group ARN",
-        )
-
-        # Master user info
-        ssm_outputs.create_parameter_and_output(
-            "master-username",
-            Constants.DEFAULT_MASTER_USERNAME,
-            "OpenSearch master username",
-        )
-
-        # Security group ID (reference to VPC stack)
-        ssm_outputs.create_parameter_and_output(
-            "security-group-id",
-            self.vpc_stack.opensearch_security_group.security_group_id,
-            "OpenSearch security group ID",
-        )
-
-        # Master password secret ARN
-        ssm_outputs.create_parameter_and_output(
-            "master-password-secret-arn",
-            self.master_password_secret.secret_arn,
-            "OpenSearch master password secret ARN",
+        ssm_outputs.create_aggregated_parameter(
+            "outputs",
+            {
+                "domain-endpoint": self.domain_endpoint,
+                "domain-arn": self.domain_arn,
+                "domain-name": self.domain_name,
+                # Note: Kibana endpoint is the same as domain endpoint for OpenSearch
+                "kms-key-arn": self.kms_key.key_arn,
+                "log-group-arn": self.log_group.log_group_arn,
+                "master-username": Constants.DEFAULT_MASTER_USERNAME,
+                # Reference to VPC stack
+                "security-group-id": self.vpc_stack.opensearch_security_group.security_group_id,
+                "master-password-secret-arn": self.master_password_secret.secret_arn,
+            },
+            "OpenSearch domain outputs (JSON)",
         )
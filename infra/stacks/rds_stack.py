@@ -5,8 +5,6 @@ RDS Stack - Creates Aurora MySQL Serverless v2 cluster with proper security.
 from aws_cdk import (
     Stack,
     aws_rds as rds,
-    aws_ec2 as ec2,
-    aws_secretsmanager as secretsmanager,
     aws_kms as kms,
     Duration,
     Tags,
@@ -19,10 +17,15 @@ if TYPE_CHECKING:
 
 from constructs import Construct
 
-from infra.config import Config
+from infra.config import EnvironmentConfig
 from infra.constructs.ssm_outputs import SsmOutputs
 from infra.constants import Constants
 
+# Engine version resolved once per process
+_AURORA_MYSQL_ENGINE_VERSION = getattr(
+    rds.AuroraMysqlEngineVersion, Constants.AURORA_MYSQL_ENGINE_VERSION
+)
+
 
 class RdsStack(Stack):
     """RDS stack with Aurora MySQL Serverless v2 cluster."""
@@ -31,7 +34,7 @@ class RdsStack(Stack):
         self,
         scope: Construct,
         construct_id: str,
-        config: Config,
+        config: EnvironmentConfig,
         vpc_stack: "VpcStack",
         secrets_stack: "SecretsStack",
         **kwargs,
@@ -42,7 +45,8 @@ class RdsStack(Stack):
         self.vpc_stack = vpc_stack
         self.secrets_stack = secrets_stack
 
-        # Create KMS key for RDS encryption
+        # Stack-local KMS key (moving the encrypted storage to another key
+        # forces its replacement, so this key is not shared)
         self.kms_key = kms.Key(
             self,
             "RdsKmsKey",
@@ -52,8 +56,6 @@ class RdsStack(Stack):
 
         # Add tags to KMS key
         Tags.of(self.kms_key).add("Purpose", "RdsEncryption")
-        for key, value in self.config.tags.items():
-            Tags.of(self.kms_key).add(key, value)
 
         # Create Aurora cluster
         self._create_aurora_cluster()
@@ -70,33 +72,28 @@ class RdsStack(Stack):
             "AuroraSubnetGroup",
             description=f"Aurora subnet group for {self.config.env_name}",
             vpc=self.vpc_stack.vpc,
-            vpc_subnets=ec2.SubnetSelection(
-                subnet_type=ec2.SubnetType.PRIVATE_ISOLATED,
-            ),
+            vpc_subnets=self.vpc_stack.private_isolated_subnet_selection,
+        )
+
+        # Engine descriptor shared by the parameter group and the cluster
+        engine = rds.DatabaseClusterEngine.aurora_mysql(
+            version=_AURORA_MYSQL_ENGINE_VERSION,
         )
 
         # Create parameter group for Aurora MySQL
         self.parameter_group = rds.ParameterGroup(
             self,
             "AuroraParameterGroup",
-            engine=rds.DatabaseClusterEngine.aurora_mysql(
-                version=getattr(
-                    rds.AuroraMysqlEngineVersion, Constants.AURORA_MYSQL_ENGINE_VERSION
-                ),
-            ),
+            engine=engine,
             description=f"Aurora MySQL parameter group for {self.config.env_name}",
-            parameters=Constants.AURORA_PARAMETERS,
+            parameters=dict(Constants.AURORA_PARAMETERS),
         )
 
         # Create Aurora cluster
         self.cluster = rds.DatabaseCluster(
             self,
             "AuroraCluster",
-            engine=rds.DatabaseClusterEngine.aurora_mysql(
-                version=getattr(
-                    rds.AuroraMysqlEngineVersion, Constants.AURORA_MYSQL_ENGINE_VERSION
-                ),
-            ),
+            engine=engine,
             credentials=rds.Credentials.from_generated_secret(
                 Constants.DEFAULT_MASTER_USERNAME,
             ),
@@ -114,16 +111,14 @@ class RdsStack(Stack):
                 ),
             ],
             vpc=self.vpc_stack.vpc,
-            vpc_subnets=ec2.SubnetSelection(
-                subnet_type=ec2.SubnetType.PRIVATE_ISOLATED,
-            ),
+            vpc_subnets=self.vpc_stack.private_isolated_subnet_selection,
             security_groups=[self.vpc_stack.db_security_group],
             default_database_name=Constants.DEFAULT_DATABASE_NAME,
             parameter_group=self.parameter_group,
             subnet_group=self.subnet_group,
             backup=rds.BackupProps(
                 retention=Duration.days(self.config.rds_backup_retention_days),
-                preferred_window=f"{Constants.AUTOMATED_SNAPSHOT_START_HOUR:02d}:00-{Constants.AUTOMATED_SNAPSHOT_START_HOUR+1:02d}:00",  # UTC
+                preferred_window=Constants.BACKUP_PREFERRED_WINDOW,
             ),
             enable_performance_insights=self.config.enable_detailed_monitoring,
             performance_insight_retention=(
@@ -142,8 +137,6 @@ class RdsStack(Stack):
         Tags.of(self.cluster).add(
             "Name", self.config.get_resource_name("aurora-cluster")
         )
-        for key, value in self.config.tags.items():
-            Tags.of(self.cluster).add(key, value)
 
     def _create_outputs(self):
         """Create SSM parameters and CloudFormation outputs."""
@@ -155,64 +148,34 @@ class RdsStack(Stack):
             stack_name="rds",
         )
 
-        # Cluster endpoints
-        ssm_outputs.create_parameter_and_output(
-            "cluster-endpoint",
-            self.cluster.cluster_endpoint.hostname,
-            "Aurora cluster endpoint",
-        )
-
-        ssm_outputs.create_parameter_and_output(
-            "cluster-port",
-            str(self.cluster.cluster_endpoint.port),
-            "Aurora cluster port",
-        )
-
-        ssm_outputs.create_parameter_and_output(
-            "cluster-reader-endpoint",
-            self.cluster.cluster_read_endpoint.hostname,
-            "Aurora cluster reader endpoint",
-        )
-
-        # Cluster ARN
-        ssm_outputs.create_parameter_and_output(
-            "cluster-arn",
-            self.cluster.cluster_arn,
-            "Aurora cluster ARN",
-        )
-
-        # Database name
-        ssm_outputs.create_parameter_and_output(
-            "database-name",
-            Constants.DEFAULT_DATABASE_NAME,
-            "Default database name",
-        )
-
-        # Secret ARN (reference to secrets stack)
-        # Note: Secret ARN is available in the secrets stack outputs
-        # ssm_outputs.create_parameter_and_output(
-        #     "secret-arn",
-        #     self.secrets_stack.rds_credentials.secret_arn,
-        #     "RDS credentials secret ARN",
-        # )
-
-        # KMS key ARN
-        ssm_outputs.create_parameter_and_output(
-            "kms-key-arn",
-            self.kms_key.key_arn,
-            "RDS KMS key ARN",
-        )
-
-        # Subnet group name
-        ssm_outputs.create_parameter_and_output(
-            "subnet-group-name",
-            self.subnet_group.subnet_group_name,
-            "RDS subnet group name",
-        )
-
-        # Parameter group name
-        ssm_outputs.create_parameter_and_output(
-            "parameter-group-name",
-            self.parameter_group.node.default_child.ref,
-            "RDS parameter group name",
+        ssm_outputs.create_parameters_bulk(
+            {
+                "cluster-endpoint": (
+                    self.cluster.cluster_endpoint.hostname,
+                    "Aurora cluster endpoint",
+                ),
+                "cluster-port": (
+                    str(self.cluster.cluster_endpoint.port),
+                    "Aurora cluster port",
+                ),
+                "cluster-reader-endpoint": (
+                    self.cluster.cluster_read_endpoint.hostname,
+                    "Aurora cluster reader endpoint",
+                ),
+                "cluster-arn": (self.cluster.cluster_arn, "Aurora cluster ARN"),
+                "database-name": (
+                    Constants.DEFAULT_DATABASE_NAME,
+                    "Default database name",
+                ),
+                # Note: Secret ARN is available in the secrets stack outputs
+                "kms-key-arn": (self.kms_key.key_arn, "RDS KMS key ARN"),
+                "subnet-group-name": (
+                    self.subnet_group.subnet_group_name,
+                    "RDS subnet group name",
+                ),
+                "parameter-group-name": (
+                    self.parameter_group.node.default_child.ref,
+                    "RDS parameter group name",
+                ),
+            }
         )
@@ -12,7 +12,7 @@ from aws_cdk import (
 )
 from constructs import Construct
 
-from infra.config import Config
+from infra.config import EnvironmentConfig
 from infra.constructs.ssm_outputs import SsmOutputs
 from infra.constants import Constants
 
@@ -24,7 +24,7 @@ class SqsStack(Stack):
         self,
         scope: Construct,
         construct_id: str,
-        config: Config,
+        config: EnvironmentConfig,
         **kwargs,
     ):
         super().__init__(scope, construct_id, **kwargs)
@@ -41,8 +41,6 @@ class SqsStack(Stack):
 
         # Add tags to KMS key
         Tags.of(self.kms_key).add("Purpose", "SqsEncryption")
-        for key, value in self.config.tags.items():
-            Tags.of(self.kms_key).add(key, value)
 
         # Create queues
         self._create_queues()
@@ -58,100 +56,74 @@ class SqsStack(Stack):
             self,
             "DeadLetterQueue",
             queue_name=self.config.get_resource_name("dlq"),
-            encryption=sqs.QueueEncryption.KMS,
-            encryption_master_key=self.kms_key,
+            # Low-sensitivity queue: SSE-SQS avoids KMS calls on every send/receive
+            encryption=sqs.QueueEncryption.SQS_MANAGED,
             retention_period=Duration.days(14),
             visibility_timeout=Duration.seconds(Constants.DEFAULT_VISIBILITY_TIMEOUT),
         )
 
-        # Main application queue
-        self.main_queue = sqs.Queue(
-            self,
-            "MainQueue",
-            queue_name=self.config.get_resource_name("main-queue"),
-            encryption=sqs.QueueEncryption.KMS,
-            encryption_master_key=self.kms_key,
-            visibility_timeout=Duration.seconds(
-                self.config.sqs_visibility_timeout_seconds
-            ),
-            retention_period=Duration.seconds(
-                self.config.sqs_message_retention_seconds
-            ),
-            dead_letter_queue=sqs.DeadLetterQueue(
-                max_receive_count=self.config.sqs_max_receive_count,
-                queue=self.dlq,
-            ),
-        )
-
-        # High priority queue
-        self.high_priority_queue = sqs.Queue(
-            self,
-            "HighPriorityQueue",
-            queue_name=self.config.get_resource_name("high-priority-queue"),
-            encryption=sqs.QueueEncryption.KMS,
-            encryption_master_key=self.kms_key,
-            visibility_timeout=Duration.seconds(
-                self.config.sqs_visibility_timeout_seconds
+        # Settings shared by every source queue
+        dead_letter_queue = sqs.DeadLetterQueue(
+            max_receive_count=self.config.sqs_max_receive_count,
+            queue=self.dlq,
+        )
+        retention_period = Duration.seconds(self.config.sqs_message_retention_seconds)
+        data_key_reuse = Duration.seconds(Constants.SQS_DATA_KEY_REUSE_SECONDS)
+        default_visibility = Duration.seconds(
+            self.config.sqs_visibility_timeout_seconds
+        )
+        batch_visibility = Duration.seconds(Constants.BATCH_QUEUE_VISIBILITY_TIMEOUT)
+
+        # Queue table: (construct id, resource name, visibility timeout, fifo, use KMS)
+        queue_specs = [
+            # Main application queue
+            ("MainQueue", "main-queue", default_visibility, False, True),
+            # High priority queue
+            (
+                "HighPriorityQueue",
+                "high-priority-queue",
+                default_visibility,
+                False,
+                True,
             ),
-            retention_period=Duration.seconds(
-                self.config.sqs_message_retention_seconds
-            ),
-            dead_letter_queue=sqs.DeadLetterQueue(
-                max_receive_count=self.config.sqs_max_receive_count,
-                queue=self.dlq,
-            ),
-        )
-
-        # FIFO queue for ordered processing
-        self.fifo_queue = sqs.Queue(
-            self,
-            "FifoQueue",
-            queue_name=f"{self.config.get_resource_name('fifo-queue')}.fifo",
-            encryption=sqs.QueueEncryption.KMS,
-            encryption_master_key=self.kms_key,
-            fifo=True,
-            content_based_deduplication=True,
-            visibility_timeout=Duration.seconds(
-                self.config.sqs_visibility_timeout_seconds
-            ),
-            retention_period=Duration.seconds(
-                self.config.sqs_message_retention_seconds
-            ),
-            dead_letter_queue=sqs.DeadLetterQueue(
-                max_receive_count=self.config.sqs_max_receive_count,
-                queue=self.dlq,
-            ),
-        )
-
-        # Batch processing queue
-        self.batch_queue = sqs.Queue(
-            self,
-            "BatchQueue",
-            queue_name=self.config.get_resource_name("batch-queue"),
-            encryption=sqs.QueueEncryption.KMS,
-            encryption_master_key=self.kms_key,
-            visibility_timeout=Duration.seconds(
-                Constants.BATCH_QUEUE_VISIBILITY_TIMEOUT
-            ),
-            retention_period=Duration.seconds(
-                self.config.sqs_message_retention_seconds
-            ),
-            dead_letter_queue=sqs.DeadLetterQueue(
-                max_receive_count=self.config.sqs_max_receive_count,
-                queue=self.dlq,
-            ),
-        )
-
-        # Add tags to all queues
-        for queue in [
-            self.dlq,
-            self.main_queue,
-            self.high_priority_queue,
-            self.fifo_queue,
-            self.batch_queue,
-        ]:
-            for key, value in self.config.tags.items():
-                Tags.of(queue).add(key, value)
+        ]
+        if self.config.sqs_enable_fifo:
+            # FIFO queue for ordered processing
+            queue_specs.append(
+                ("FifoQueue", "fifo-queue", default_visibility, True, True)
+            )
+        if self.config.sqs_enable_batch:
+            # Batch processing queue (low sensitivity: SSE-SQS avoids KMS calls)
+            queue_specs.append(
+                ("BatchQueue", "batch-queue", batch_visibility, False, False)
+            )
+
+        # Queues keyed by resource name, in table order
+        self._queues = {}
+        for construct_id, name, visibility_timeout, fifo, use_kms in queue_specs:
+            queue_name = self.config.get_resource_name(name)
+            self._queues[name] = sqs.Queue(
+                self,
+                construct_id,
+                queue_name=f"{queue_name}.fifo" if fifo else queue_name,
+                encryption=(
+                    sqs.QueueEncryption.KMS
+                    if use_kms
+                    else sqs.QueueEncryption.SQS_MANAGED
+                ),
+                encryption_master_key=self.kms_key if use_kms else None,
+                data_key_reuse=data_key_reuse if use_kms else None,
+                fifo=True if fifo else None,
+                content_based_deduplication=True if fifo else None,
+                visibility_timeout=visibility_timeout,
+                retention_period=retention_period,
+                dead_letter_queue=dead_letter_queue,
+            )
+        self.main_queue = self._queues["main-queue"]
+        self.high_priority_queue = self._queues["high-priority-queue"]
+        # Optional queues are None when disabled for the environment
+        self.fifo_queue = self._queues.get("fifo-queue")
+        self.batch_queue = self._queues.get("batch-queue")
 
         # Create CloudWatch alarms for DLQ
         self._create_dlq_alarms()
@@ -159,11 +131,38 @@ class SqsStack(Stack):
     def _create_dlq_alarms(self):
         """Create CloudWatch alarms for Dead Letter Queue monitoring."""
 
+        messages_metric = self.dlq.metric_approximate_number_of_messages_visible()
+        age_metric = self.dlq.metric_approximate_age_of_oldest_message()
+
+        # Outside prod a single alarm covers both DLQ conditions
+        self.dlq_age_alarm = None
+        if not self.config.is_prod:
+            self.dlq_alarm = cloudwatch.Alarm(
+                self,
+                "DlqCombinedAlarm",
+                metric=cloudwatch.MathExpression(
+                    expression=(
+                        "IF(messages > 0 OR age > "
+                        f"{Constants.DLQ_AGE_THRESHOLD_SECONDS}, 1, 0)"
+                    ),
+                    using_metrics={"messages": messages_metric, "age": age_metric},
+                    label="DLQ messages or stuck messages",
+                ),
+                threshold=1,
+                evaluation_periods=Constants.DLQ_EVALUATION_PERIODS,
+                alarm_description=(
+                    "Alarm when messages are sent to Dead Letter Queue "
+                    "or are stuck there for too long"
+                ),
+                alarm_name=self.config.get_resource_name("dlq-combined-alarm"),
+            )
+            return
+
         # Alarm for messages in DLQ
         self.dlq_alarm = cloudwatch.Alarm(
             self,
             "DlqMessagesAlarm",
-            metric=self.dlq.metric_approximate_number_of_messages_visible(),
+            metric=messages_metric,
             threshold=1,
             evaluation_periods=1,
             alarm_description="Alarm when messages are sent to Dead Letter Queue",
@@ -174,18 +173,13 @@ class SqsStack(Stack):
         self.dlq_age_alarm = cloudwatch.Alarm(
             self,
             "DlqAgeAlarm",
-            metric=self.dlq.metric_approximate_age_of_oldest_message(),
+            metric=age_metric,
             threshold=Constants.DLQ_AGE_THRESHOLD_SECONDS,
             evaluation_periods=Constants.EVALUATION_PERIODS,
             alarm_description="Alarm when messages are stuck in DLQ for too long",
             alarm_name=f"{self.config.get_resource_name('dlq-age-alarm')}",
         )
 
-        # Add tags to alarms
-        for alarm in [self.dlq_alarm, self.dlq_age_alarm]:
-            for key, value in self.config.tags.items():
-                Tags.of(alarm).add(key, value)
-
     def _create_outputs(self):
         """Create SSM parameters and CloudFormation outputs."""
 
@@ -196,84 +190,51 @@ class SqsStack(Stack):
             stack_name="sqs",
         )
 
-        # Queue URLs
-        ssm_outputs.create_parameter_and_output(
-            "main-queue-url",
-            self.main_queue.queue_url,
-            "Main queue URL",
-        )
-
-        ssm_outputs.create_parameter_and_output(
-            "high-priority-queue-url",
-            self.high_priority_queue.queue_url,
-            "High priority queue URL",
-        )
-
-        ssm_outputs.create_parameter_and_output(
-            "fifo-queue-url",
-            self.fifo_queue.queue_url,
-            "FIFO queue URL",
-        )
-
-        ssm_outputs.create_parameter_and_output(
-            "batch-queue-url",
-            self.batch_queue.queue_url,
-            "Batch queue URL",
-        )
-
-        ssm_outputs.create_parameter_and_output(
-            "dlq-url",
-            self.dlq.queue_url,
-            "Dead letter queue URL",
-        )
-
-        # Queue ARNs
-        ssm_outputs.create_parameter_and_output(
-            "main-queue-arn",
-            self.main_queue.queue_arn,
-            "Main queue ARN",
-        )
-
-        ssm_outputs.create_parameter_and_output(
-            "high-priority-queue-arn",
-            self.high_priority_queue.queue_arn,
-            "High priority queue ARN",
-        )
-
-        ssm_outputs.create_parameter_and_output(
-            "fifo-queue-arn",
-            self.fifo_queue.queue_arn,
-            "FIFO queue ARN",
-        )
-
-        ssm_outputs.create_parameter_and_output(
-            "batch-queue-arn",
-            self.batch_queue.queue_arn,
-            "Batch queue ARN",
-        )
-
-        ssm_outputs.create_parameter_and_output(
-            "dlq-arn",
-            self.dlq.queue_arn,
-            "Dead letter queue ARN",
-        )
-
-        # KMS key ARN
-        ssm_outputs.create_parameter_and_output(
-            "kms-key-arn",
-            self.kms_key.key_arn,
-            "SQS KMS key ARN",
-        )
-
-        # Alarm ARNs
-        ssm_outputs.create_parameter_and_output(
-            "dlq-alarm-arn",
-            self.dlq_alarm.alarm_arn,
-            "DLQ messages alarm ARN",
-        )
-
-        ssm_outputs.create_parameter_and_output(
-            "dlq-age-alarm-arn",
-            self.dlq_age_alarm.alarm_arn,
-            "DLQ age alarm ARN",
-        )
+        parameters = {
+            # Queue URLs
+            "main-queue-url": (self.main_queue.queue_url, "Main queue URL"),
+            "high-priority-queue-url": (
+                self.high_priority_queue.queue_url,
+                "High priority queue URL",
+            ),
+            "dlq-url": (self.dlq.queue_url, "Dead letter queue URL"),
+            # Queue ARNs
+            "main-queue-arn": (self.main_queue.queue_arn, "Main queue ARN"),
+            "high-priority-queue-arn": (
+                self.high_priority_queue.queue_arn,
+                "High priority queue ARN",
+            ),
+            "dlq-arn": (self.dlq.queue_arn, "Dead letter queue ARN"),
+            # KMS key ARN
+            "kms-key-arn": (self.kms_key.key_arn, "SQS KMS key ARN"),
+            # Alarm ARNs (prod has separate messages and age alarms)
+            "dlq-alarm-arn": (
+                self.dlq_alarm.alarm_arn,
+                (
+                    "DLQ messages alarm ARN"
+                    if self.config.is_prod
+                    else "DLQ combined messages/age alarm ARN"
+                ),
+            ),
+        }
+
+        # Optional resources
+        if self.fifo_queue is not None:
+            parameters["fifo-queue-url"] = (self.fifo_queue.queue_url, "FIFO queue URL")
+            parameters["fifo-queue-arn"] = (self.fifo_queue.queue_arn, "FIFO queue ARN")
+        if self.batch_queue is not None:
+            parameters["batch-queue-url"] = (
+                self.batch_queue.queue_url,
+                "Batch queue URL",
+            )
+            parameters["batch-queue-arn"] = (
+                self.batch_queue.queue_arn,
+                "Batch queue ARN",
+            )
+        if self.dlq_age_alarm is not None:
+            parameters["dlq-age-alarm-arn"] = (
+                self.dlq_age_alarm.alarm_arn,
+                "DLQ age alarm ARN",
+            )
+
+        ssm_outputs.create_parameters_bulk(parameters)
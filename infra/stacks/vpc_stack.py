@@ -3,15 +3,18 @@ VPC Stack - Creates a multi-AZ VPC with public, private, and isolated subnets.
 """
 
 from aws_cdk import (
+    Duration,
+    RemovalPolicy,
     Stack,
     aws_ec2 as ec2,
     aws_logs as logs,
     aws_iam as iam,
+    aws_s3 as s3,
     Tags,
 )
 from constructs import Construct
 
-from infra.config import Config
+from infra.config import EnvironmentConfig
 from infra.constructs.ssm_outputs import SsmOutputs
 from infra.constants import Constants
 
@@ -23,7 +26,7 @@ class VpcStack(Stack):
         self,
         scope: Construct,
         construct_id: str,
-        config: Config,
+        config: EnvironmentConfig,
         **kwargs,
     ):
         super().__init__(scope, construct_id, **kwargs)
@@ -63,8 +66,12 @@ class VpcStack(Stack):
 
         # Add tags to VPC
         Tags.of(self.vpc).add("Name", self.config.get_resource_name("vpc"))
-        for key, value in self.config.tags.items():
-            Tags.of(self.vpc).add(key, value)
+
+        # Subnet selections shared with dependent stacks
+        self.private_with_egress_subnets = self.vpc.private_subnets
+        self.private_isolated_subnet_selection = ec2.SubnetSelection(
+            subnet_type=ec2.SubnetType.PRIVATE_ISOLATED,
+        )
 
         # Create security groups
         self._create_security_groups()
@@ -79,6 +86,10 @@ class VpcStack(Stack):
     def _create_security_groups(self):
         """Create common security groups."""
 
+        # Peers and ports shared by the ingress rules below
+        any_ipv4 = ec2.Peer.any_ipv4()
+        https = ec2.Port.tcp(Constants.HTTPS_PORT)
+
         # Default security group for VPC
         self.default_security_group = ec2.SecurityGroup(
             self,
@@ -99,13 +110,13 @@ class VpcStack(Stack):
 
         # Allow HTTP and HTTPS from anywhere
         self.web_security_group.add_ingress_rule(
-            peer=ec2.Peer.any_ipv4(),
+            peer=any_ipv4,
             connection=ec2.Port.tcp(Constants.HTTP_PORT),
             description="Allow HTTP from anywhere",
         )
         self.web_security_group.add_ingress_rule(
-            peer=ec2.Peer.any_ipv4(),
-            connection=ec2.Port.tcp(Constants.HTTPS_PORT),
+            peer=any_ipv4,
+            connection=https,
             description="Allow HTTPS from anywhere",
         )
 
@@ -153,7 +164,7 @@ class VpcStack(Stack):
         # Allow HTTPS traffic from app servers
         self.opensearch_security_group.add_ingress_rule(
             peer=self.app_security_group,
-            connection=ec2.Port.tcp(Constants.HTTPS_PORT),
+            connection=https,
             description="Allow HTTPS from app servers",
         )
 
@@ -166,44 +177,96 @@ class VpcStack(Stack):
             allow_all_outbound=True,
         )
 
-        # Add tags to security groups
-        for sg in [
-            self.default_security_group,
-            self.web_security_group,
-            self.app_security_group,
-            self.db_security_group,
-            self.opensearch_security_group,
-            self.lambda_security_group,
-        ]:
-            for key, value in self.config.tags.items():
-                Tags.of(sg).add(key, value)
-
     def _create_flow_logs(self):
-        """Create VPC Flow Logs."""
-
-        # Create CloudWatch Log Group for VPC Flow Logs
-        self.flow_log_group = logs.LogGroup(
-            self,
-            "VpcFlowLogGroup",
-            log_group_name=f"/aws/vpc/flowlogs/{self.config.get_resource_name('vpc')}",
-            retention=(
-                logs.RetentionDays.ONE_MONTH
-                if self.config.is_dev
-                else logs.RetentionDays.THREE_MONTHS
-            ),
-        )
-
-        # Create IAM role for VPC Flow Logs
-        self.flow_log_role = iam.Role(
-            self,
-            "VpcFlowLogRole",
-            assumed_by=iam.ServicePrincipal("vpc-flowlogs.amazonaws.com"),
-            managed_policies=[
-                iam.ManagedPolicy.from_aws_managed_policy_name(
-                    "service-role/VPCFlowLogsDeliveryRolePolicy"
+        """Create VPC Flow Logs delivered to S3 or CloudWatch Logs."""
+
+        if self.config.flow_log_destination == "s3":
+            # S3 delivery needs neither a log group nor an IAM role
+            self.flow_log_bucket = s3.Bucket(
+                self,
+                "VpcFlowLogBucket",
+                encryption=s3.BucketEncryption.S3_MANAGED,
+                block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+                enforce_ssl=True,
+                # Empty and delete the bucket on teardown outside prod
+                removal_policy=(
+                    RemovalPolicy.RETAIN
+                    if self.config.is_prod
+                    else RemovalPolicy.DESTROY
                 ),
-            ],
-        )
+                auto_delete_objects=not self.config.is_prod,
+                lifecycle_rules=[
+                    s3.LifecycleRule(
+                        expiration=Duration.days(
+                            Constants.DEV_FLOW_LOG_RETENTION_DAYS
+                            if self.config.is_dev
+                            else Constants.FLOW_LOG_RETENTION_DAYS
+                        ),
+                    ),
+                ],
+            )
+
+            # Declare the log delivery grants so stack updates keep them
+            delivery = iam.ServicePrincipal("delivery.logs.amazonaws.com")
+            source_account = {"aws:SourceAccount": self.account}
+            self.flow_log_bucket.add_to_resource_policy(
+                iam.PolicyStatement(
+                    sid="AWSLogDeliveryWrite",
+                    principals=[delivery],
+                    actions=["s3:PutObject"],
+                    resources=[
+                        self.flow_log_bucket.arn_for_objects(
+                            f"AWSLogs/{self.account}/*"
+                        )
+                    ],
+                    conditions={
+                        "StringEquals": {
+                            "s3:x-amz-acl": "bucket-owner-full-control",
+                            **source_account,
+                        },
+                    },
+                )
+            )
+            self.flow_log_bucket.add_to_resource_policy(
+                iam.PolicyStatement(
+                    sid="AWSLogDeliveryAclCheck",
+                    principals=[delivery],
+                    actions=["s3:GetBucketAcl", "s3:ListBucket"],
+                    resources=[self.flow_log_bucket.bucket_arn],
+                    conditions={"StringEquals": source_account},
+                )
+            )
+            destination = ec2.FlowLogDestination.to_s3(self.flow_log_bucket)
+            flow_log_store: Construct = self.flow_log_bucket
+        else:
+            # Create CloudWatch Log Group for VPC Flow Logs
+            self.flow_log_group = logs.LogGroup(
+                self,
+                "VpcFlowLogGroup",
+                log_group_name=f"/aws/vpc/flowlogs/{self.config.get_resource_name('vpc')}",
+                retention=(
+                    logs.RetentionDays.ONE_WEEK
+                    if self.config.is_dev
+                    else logs.RetentionDays.THREE_MONTHS
+                ),
+            )
+
+            # Create IAM role for VPC Flow Logs
+            self.flow_log_role = iam.Role(
+                self,
+                "VpcFlowLogRole",
+                assumed_by=iam.ServicePrincipal("vpc-flowlogs.amazonaws.com"),
+                managed_policies=[
+                    iam.ManagedPolicy.from_aws_managed_policy_name(
+                        "service-role/VPCFlowLogsDeliveryRolePolicy"
+                    ),
+                ],
+            )
+            destination = ec2.FlowLogDestination.to_cloud_watch_logs(
+                log_group=self.flow_log_group,
+                iam_role=self.flow_log_role,
+            )
+            flow_log_store = self.flow_log_group
 
         # Create VPC Flow Logs
         ec2.FlowLog(
@@ -211,18 +274,11 @@ class VpcStack(Stack):
             "VpcFlowLog",
             resource_type=ec2.FlowLogResourceType.from_vpc(self.vpc),
             traffic_type=ec2.FlowLogTrafficType.ALL,
-            destination=ec2.FlowLogDestination.to_cloud_watch_logs(
-                log_group=self.flow_log_group,
-                iam_role=self.flow_log_role,
-            ),
+            destination=destination,
         )
 
         # Add tags
-        Tags.of(self.flow_log_group).add(
-            "Purpose", Constants.PURPOSE_TAGS["VPC_FLOW_LOGS"]
-        )
-        for key, value in self.config.tags.items():
-            Tags.of(self.flow_log_group).add(key, value)
+        Tags.of(flow_log_store).add("Purpose", Constants.PURPOSE_TAGS["VPC_FLOW_LOGS"])
 
     def _create_outputs(self):
         """Create SSM parameters and CloudFormation outputs."""
@@ -234,71 +290,60 @@ class VpcStack(Stack):
             stack_name="vpc",
         )
 
-        # VPC ID
-        ssm_outputs.create_parameter_and_output(
-            "vpc-id",
-            self.vpc.vpc_id,
-            "VPC ID",
-        )
-
-        # Subnet IDs
-        public_subnet_ids = [subnet.subnet_id for subnet in self.vpc.public_subnets]
-        private_subnet_ids = [subnet.subnet_id for subnet in self.vpc.private_subnets]
-        isolated_subnet_ids = [subnet.subnet_id for subnet in self.vpc.isolated_subnets]
-
-        ssm_outputs.create_string_list_parameter(
-            "public-subnet-ids",
-            public_subnet_ids,
-            "Public subnet IDs",
-        )
-
-        ssm_outputs.create_string_list_parameter(
-            "private-subnet-ids",
-            private_subnet_ids,
-            "Private subnet IDs",
-        )
-
-        ssm_outputs.create_string_list_parameter(
-            "isolated-subnet-ids",
-            isolated_subnet_ids,
-            "Isolated subnet IDs",
-        )
-
-        # Security Group IDs
-        ssm_outputs.create_parameter_and_output(
-            "web-security-group-id",
-            self.web_security_group.security_group_id,
-            "Web security group ID",
-        )
-
-        ssm_outputs.create_parameter_and_output(
-            "app-security-group-id",
-            self.app_security_group.security_group_id,
-            "Application security group ID",
-        )
-
-        ssm_outputs.create_parameter_and_output(
-            "db-security-group-id",
-            self.db_security_group.security_group_id,
-            "Database security group ID",
-        )
-
-        ssm_outputs.create_parameter_and_output(
-            "opensearch-security-group-id",
-            self.opensearch_security_group.security_group_id,
-            "OpenSearch security group ID",
+        ssm_outputs.create_parameters_bulk(
+            {
+                # VPC ID
+                "vpc-id": (self.vpc.vpc_id, "VPC ID"),
+                # Security Group IDs
+                "web-security-group-id": (
+                    self.web_security_group.security_group_id,
+                    "Web security group ID",
+                ),
+                "app-security-group-id": (
+                    self.app_security_group.security_group_id,
+                    "Application security group ID",
+                ),
+                "db-security-group-id": (
+                    self.db_security_group.security_group_id,
+                    "Database security group ID",
+                ),
+                "opensearch-security-group-id": (
+                    self.opensearch_security_group.security_group_id,
+                    "OpenSearch security group ID",
+                ),
+                "lambda-security-group-id": (
+                    self.lambda_security_group.security_group_id,
+                    "Lambda security group ID",
+                ),
+            }
         )
 
-        ssm_outputs.create_parameter_and_output(
-            "lambda-security-group-id",
-            self.lambda_security_group.security_group_id,
-            "Lambda security group ID",
+        # Subnet IDs, one string-list parameter per tier (selected Node-side)
+        vpc = self.vpc
+        subnet_tiers = (
+            ("public-subnet-ids", ec2.SubnetType.PUBLIC, "Public subnet IDs"),
+            (
+                "private-subnet-ids",
+                ec2.SubnetType.PRIVATE_WITH_EGRESS,
+                "Private subnet IDs",
+            ),
+            (
+                "isolated-subnet-ids",
+                ec2.SubnetType.PRIVATE_ISOLATED,
+                "Isolated subnet IDs",
+            ),
         )
+        create_string_list_parameter = ssm_outputs.create_string_list_parameter
+        for parameter_name, subnet_type, description in subnet_tiers:
+            create_string_list_parameter(
+                parameter_name,
+                vpc.select_subnets(subnet_type=subnet_type).subnet_ids,
+                description,
+            )
 
         # Availability Zones
-        azs = self.vpc.availability_zones
-        ssm_outputs.create_string_list_parameter(
+        create_string_list_parameter(
             "availability-zones",
-            azs,
+            vpc.availability_zones,
             "Availability zones",
         )
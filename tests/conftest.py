@@ -2,35 +2,106 @@
 Pytest configuration and fixtures for CDK infrastructure tests.
 """
 
+import copy
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+from importlib.metadata import version
+from types import SimpleNamespace
+
 import pytest
-from aws_cdk import App, Stack
+from aws_cdk import App, Stack, assertions
+from aws_cdk import aws_ec2 as ec2
+from aws_cdk import aws_secretsmanager as secretsmanager
 from constructs import Construct
 
-from infra.config import Config
+from infra.config import EnvironmentConfig
+from infra.stacks.iam_stack import IamStack
+
+
+def _contains(actual, expected):
+    """Check that ``expected`` is a deep subset of ``actual`` (dicts match partially)."""
+    if isinstance(expected, dict):
+        return isinstance(actual, dict) and all(
+            key in actual and _contains(actual[key], value)
+            for key, value in expected.items()
+        )
+    return actual == expected
+
+
+def resource_has(resources, resource_type, expected):
+    """Check whether any synthesized resource of the type has the expected properties."""
+    return any(
+        resource["Type"] == resource_type
+        and _contains(resource.get("Properties", {}), expected)
+        for resource in resources.values()
+    )
+
+
+def resource_counts(resources):
+    """Count synthesized resources by type in a single pass."""
+    return Counter(resource["Type"] for resource in resources.values())
+
+
+@contextmanager
+def temp_app():
+    """Yield a CDK app whose cloud assembly directory is removed afterwards."""
+    outdir = tempfile.mkdtemp(prefix="cdk.out")
+    try:
+        yield App(outdir=outdir)
+    finally:
+        shutil.rmtree(outdir, ignore_errors=True)
 
 
 @pytest.fixture
 def app():
     """Create a CDK app for testing."""
-    return App()
+    with temp_app() as app:
+        yield app
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
+def module_app():
+    """Create a CDK app shared by the read-only tests of a module.
+
+    The construct tree is locked by the first synthesis, so every stack in
+    this app must be created before any template is taken from it.
+    """
+    with temp_app() as app:
+        yield app
+
+
+@pytest.fixture(scope="module")
+def synthed_assembly(module_app):
+    """Synthesize the module app once and share the resulting cloud assembly.
+
+    Request the module's stack fixtures before this one; the tree cannot be
+    modified once it has been synthesized.
+    """
+    return module_app.synth()
+
+
+@pytest.fixture(scope="session")
 def dev_config():
     """Create a dev environment configuration."""
-    return Config("dev")
+    return EnvironmentConfig.for_env("dev")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def staging_config():
     """Create a staging environment configuration."""
-    return Config("staging")
+    return EnvironmentConfig.for_env("staging")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def prod_config():
     """Create a prod environment configuration."""
-    return Config("prod")
+    return EnvironmentConfig.for_env("prod")
 
 
 @pytest.fixture
@@ -42,12 +113,38 @@ def test_stack(app, dev_config):
 class MockVpcStack(Stack):
     """Mock VPC stack for testing other stacks."""
 
-    def __init__(self, scope: Construct, construct_id: str, config: Config, **kwargs):
+    def __init__(
+        self,
+        scope: Construct,
+        construct_id: str,
+        config: EnvironmentConfig,
+        minimal: bool = False,
+        **kwargs,
+    ):
         super().__init__(scope, construct_id, **kwargs)
 
-        from aws_cdk import aws_ec2 as ec2
+        subnet_configuration = [
+            ec2.SubnetConfiguration(
+                name="Public",
+                subnet_type=ec2.SubnetType.PUBLIC,
+                cidr_mask=24,
+            ),
+            ec2.SubnetConfiguration(
+                name="Private",
+                subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS,
+                cidr_mask=24,
+            ),
+        ]
+        if not minimal:
+            subnet_configuration.append(
+                ec2.SubnetConfiguration(
+                    name="Isolated",
+                    subnet_type=ec2.SubnetType.PRIVATE_ISOLATED,
+                    cidr_mask=24,
+                )
+            )
 
-        # Create a mock VPC with all subnet types
+        # Create a mock VPC (minimal variant has no isolated tier)
         self.vpc = ec2.Vpc(
             self,
             "MockVpc",
@@ -55,26 +152,17 @@ class MockVpcStack(Stack):
             max_azs=2,
             enable_dns_hostnames=True,
             enable_dns_support=True,
-            subnet_configuration=[
-                ec2.SubnetConfiguration(
-                    name="Public",
-                    subnet_type=ec2.SubnetType.PUBLIC,
-                    cidr_mask=24,
-                ),
-                ec2.SubnetConfiguration(
-                    name="Private",
-                    subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS,
-                    cidr_mask=24,
-                ),
-                ec2.SubnetConfiguration(
-                    name="Isolated",
-                    subnet_type=ec2.SubnetType.PRIVATE_ISOLATED,
-                    cidr_mask=24,
-                ),
-            ],
+            subnet_configuration=subnet_configuration,
+            # Private (egress) subnets need a NAT gateway, even in the minimal variant
             nat_gateways=1,
         )
 
+        # Mirror the shared subnet selections of the real VPC stack
+        self.private_with_egress_subnets = self.vpc.private_subnets
+        self.private_isolated_subnet_selection = ec2.SubnetSelection(
+            subnet_type=ec2.SubnetType.PRIVATE_ISOLATED,
+        )
+
         # Create mock security groups
         self.web_security_group = ec2.SecurityGroup(
             self,
@@ -115,11 +203,11 @@ class MockVpcStack(Stack):
 class MockSecretsStack(Stack):
     """Mock Secrets stack for testing other stacks."""
 
-    def __init__(self, scope: Construct, construct_id: str, config: Config, **kwargs):
+    def __init__(
+        self, scope: Construct, construct_id: str, config: EnvironmentConfig, **kwargs
+    ):
         super().__init__(scope, construct_id, **kwargs)
 
-        from aws_cdk import aws_secretsmanager as secretsmanager
-
         # Create mock secrets
         self.rds_credentials = secretsmanager.Secret(
             self,
@@ -146,13 +234,166 @@ class MockSecretsStack(Stack):
         )
 
 
-@pytest.fixture
-def mock_vpc_stack(app, dev_config):
-    """Create a mock VPC stack for testing."""
-    return MockVpcStack(app, "MockVpcStack", dev_config)
+@pytest.fixture(scope="module")
+def module_mock_secrets_stack(module_app, dev_config):
+    """Create a mock Secrets stack in the module app for testing."""
+    return MockSecretsStack(module_app, "MockSecretsStack", dev_config)
 
 
-@pytest.fixture
-def mock_secrets_stack(app, dev_config):
-    """Create a mock Secrets stack for testing."""
-    return MockSecretsStack(app, "MockSecretsStack", dev_config)
+def _mock_queue(name):
+    """Create a mock queue exposing only its ARN."""
+    return SimpleNamespace(queue_arn=f"arn:aws:sqs:us-east-1:123456789012:{name}")
+
+
+_OPENSEARCH_DOMAIN_ARN = "arn:aws:es:us-east-1:123456789012:domain/test-domain"
+
+# Mock stack prototypes, built once at import and shallow-copied per test module
+_SQS_STACK_PROTO = SimpleNamespace(
+    main_queue=_mock_queue("test-queue"),
+    high_priority_queue=_mock_queue("test-hp-queue"),
+    fifo_queue=_mock_queue("test-fifo-queue"),
+    batch_queue=_mock_queue("test-batch-queue"),
+    dlq=_mock_queue("test-dlq"),
+)
+_OPENSEARCH_STACK_PROTO = SimpleNamespace(
+    domain_arn=_OPENSEARCH_DOMAIN_ARN,
+    domain=SimpleNamespace(domain_arn=_OPENSEARCH_DOMAIN_ARN),
+)
+
+
+@pytest.fixture(scope="module")
+def mock_sqs_stack():
+    """Create a mock SQS stack exposing the queue ARNs the IAM stack reads."""
+    return copy.copy(_SQS_STACK_PROTO)
+
+
+@pytest.fixture(scope="module")
+def mock_sqs_stack_without_optional_queues():
+    """Create a mock SQS stack without the FIFO and batch queues (as in dev)."""
+    return SimpleNamespace(
+        **{**vars(_SQS_STACK_PROTO), "fifo_queue": None, "batch_queue": None}
+    )
+
+
+@pytest.fixture(scope="module")
+def mock_opensearch_stack():
+    """Create a mock OpenSearch stack exposing the domain ARN."""
+    return copy.copy(_OPENSEARCH_STACK_PROTO)
+
+
+@pytest.fixture(scope="module")
+def iam_mock_dependencies(
+    module_mock_secrets_stack, mock_sqs_stack, mock_opensearch_stack
+):
+    """Collect the mock RDS, SQS and OpenSearch stacks the IAM stack depends on."""
+    return {
+        "rds_stack": SimpleNamespace(secrets_stack=module_mock_secrets_stack),
+        "sqs_stack": mock_sqs_stack,
+        "opensearch_stack": mock_opensearch_stack,
+    }
+
+
+@pytest.fixture(scope="module")
+def iam_stack_template(module_app, dev_config, iam_mock_dependencies):
+    """Synthesize a dev IAM stack once per module."""
+    stack = IamStack(module_app, "TestIamStack", dev_config, **iam_mock_dependencies)
+    return assertions.Template.from_stack(stack)
+
+
+@pytest.fixture(scope="module")
+def dev_resources(dev_template):
+    """Plain ``Resources`` dict of the module's dev template."""
+    return dev_template.to_json()["Resources"]
+
+
+@pytest.fixture(scope="module")
+def prod_resources(prod_template):
+    """Plain ``Resources`` dict of the module's prod template."""
+    return prod_template.to_json()["Resources"]
+
+
+# Opt-in skipping of stack test modules whose sources are unchanged since their
+# last green run (set CDK_TESTS_SKIP_UNCHANGED=1)
+_SKIP_UNCHANGED = os.environ.get("CDK_TESTS_SKIP_UNCHANGED") == "1"
+_STACK_HASHES_CACHE_KEY = "cdk/stack_hashes"
+_SHARED_SOURCES = (
+    "infra/config.py",
+    "infra/constants.py",
+    "infra/constructs",
+    "tests/conftest.py",
+)
+_collected_tests = defaultdict(set)
+_passed_tests = set()
+_failed_modules = set()
+
+
+@lru_cache(maxsize=None)
+def _stack_source_hash(rootpath, module_id):
+    """Hash a stack test module with its sources and toolchain (None if not a stack test)."""
+    test_path = rootpath / module_id
+    stack_path = (
+        rootpath / "infra" / "stacks" / (test_path.stem[len("test_") :] + ".py")
+    )
+    if not stack_path.is_file():
+        return None
+
+    paths = [stack_path, test_path]
+    for shared in _SHARED_SOURCES:
+        shared_path = rootpath / shared
+        paths.extend(
+            sorted(shared_path.rglob("*.py")) if shared_path.is_dir() else [shared_path]
+        )
+
+    # A CDK or Python upgrade can change the synthesized templates
+    digest = hashlib.sha256()
+    digest.update(f"aws-cdk-lib {version('aws-cdk-lib')}\n".encode())
+    digest.update(f"python {sys.version}\n".encode())
+    for path in paths:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """Skip stack test modules whose sources match their last green run.
+
+    Runs before -k/-m/--lf deselection so every collected test is recorded.
+    """
+    if not _SKIP_UNCHANGED:
+        return
+
+    last_green = config.cache.get(_STACK_HASHES_CACHE_KEY, {})
+    skip = pytest.mark.skip(reason="stack code unchanged since last green run")
+    for item in items:
+        module_id = item.nodeid.split("::")[0]
+        _collected_tests[module_id].add(item.nodeid)
+        digest = _stack_source_hash(config.rootpath, module_id)
+        if digest is not None and last_green.get(module_id) == digest:
+            item.add_marker(skip)
+
+
+def pytest_runtest_logreport(report):
+    """Track which tests passed and which test modules had failures."""
+    if _SKIP_UNCHANGED:
+        if report.failed:
+            _failed_modules.add(report.nodeid.split("::")[0])
+        elif report.when == "call" and report.passed:
+            _passed_tests.add(report.nodeid)
+
+
+def pytest_sessionfinish(session):
+    """Record the hashes of stack test modules whose collected tests all passed."""
+    if not _SKIP_UNCHANGED:
+        return
+
+    config = session.config
+    last_green = config.cache.get(_STACK_HASHES_CACHE_KEY, {})
+    for module_id, nodeids in _collected_tests.items():
+        if module_id in _failed_modules or not nodeids <= _passed_tests:
+            continue
+        digest = _stack_source_hash(config.rootpath, module_id)
+        if digest is not None:
+            last_green[module_id] = digest
+    for module_id in _failed_modules:
+        last_green.pop(module_id, None)
+    config.cache.set(_STACK_HASHES_CACHE_KEY, last_green)
@@ -0,0 +1,69 @@
+"""
+Unit tests for environment configuration.
+"""
+
+import pytest
+
+from infra.config import EnvironmentConfig
+
+
+def test_config_instances_cached():
+    """Test that configs are memoized per environment name."""
+    assert EnvironmentConfig.for_env("dev") is EnvironmentConfig.for_env("dev")
+    assert EnvironmentConfig.for_env("dev") is not EnvironmentConfig.for_env("prod")
+
+
+def test_config_attributes(prod_config):
+    """Test that environment settings are exposed on the config."""
+    assert prod_config.env_name == "prod"
+    assert prod_config.rds_max_capacity == 16.0
+    assert prod_config.opensearch_instance_count == 3
+    assert prod_config.is_prod
+
+
+def test_unknown_environment():
+    """Test that unknown environments are rejected."""
+    with pytest.raises(ValueError):
+        EnvironmentConfig.for_env("qa")
+
+
+def test_environment_config_immutable(dev_config):
+    """Test that environment configurations cannot be mutated."""
+    with pytest.raises(AttributeError):
+        dev_config.rds_max_capacity = 64.0
+
+
+def test_invalid_flow_log_destination():
+    """Test that an unknown flow log destination is rejected."""
+    with pytest.raises(ValueError, match="Unknown flow log destination"):
+        EnvironmentConfig(name="dev", flow_log_destination="S3")
+
+
+def test_config_tags(staging_config):
+    """Test that common tags are built once and read-only."""
+    assert staging_config.tags == {
+        "Environment": "staging",
+        "Project": "aws-cdk-infra",
+        "ManagedBy": "CDK",
+    }
+    assert staging_config.tags is staging_config.tags
+
+    # Tags are shared by every stack, so they must not be mutable
+    with pytest.raises(TypeError):
+        staging_config.tags["Owner"] = "someone"
+
+
+def test_resource_naming(dev_config):
+    """Test standardized resource and SSM parameter names."""
+    assert dev_config.get_resource_name("dlq") == "aws-cdk-infra-dlq-dev"
+    assert (
+        dev_config.get_resource_name("queue", suffix="a") == "aws-cdk-infra-queue-dev-a"
+    )
+    assert dev_config.get_ssm_parameter_name("vpc", "vpc-id") == "/infra/dev/vpc/vpc-id"
+
+
+def test_config_has_no_instance_dict(dev_config):
+    """Test that configs are slotted and reject unknown attributes."""
+    assert not hasattr(dev_config, "__dict__")
+    with pytest.raises(AttributeError):
+        dev_config.not_a_setting
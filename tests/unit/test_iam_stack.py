@@ -2,395 +2,147 @@
 Unit tests for IAM stack.
 """
 
+from types import SimpleNamespace
+
 import pytest
 from aws_cdk import assertions
-from aws_cdk import aws_iam as iam
 
 from infra.stacks.iam_stack import IamStack
-
-
-def test_iam_stack_creation(app, dev_config, mock_vpc_stack, mock_secrets_stack):
+from tests.conftest import MockSecretsStack, resource_counts, temp_app
+
+# Matchers are built once and shared by the tests
+_ANY = assertions.Match.any_value()
+
+_LAMBDA_ROLE_PROPERTIES = {
+    "AssumeRolePolicyDocument": {
+        "Statement": [
+            {
+                "Effect": "Allow",
+                "Principal": {"Service": "lambda.amazonaws.com"},
+                "Action": "sts:AssumeRole",
+            }
+        ]
+    },
+    "ManagedPolicyArns": _ANY,
+}
+
+_APPLICATION_ROLE_PROPERTIES = {
+    "AssumeRolePolicyDocument": {
+        "Statement": [
+            {
+                "Effect": "Allow",
+                "Principal": {"Service": "ec2.amazonaws.com"},
+                "Action": "sts:AssumeRole",
+            },
+            {
+                "Effect": "Allow",
+                "Principal": {"Service": "ecs-tasks.amazonaws.com"},
+                "Action": "sts:AssumeRole",
+            },
+        ]
+    },
+}
+
+_SQS_ACCESS_POLICY_PROPERTIES = {
+    "PolicyDocument": {
+        "Statement": [
+            {
+                "Effect": "Allow",
+                "Action": [
+                    "sqs:SendMessage",
+                    "sqs:SendMessageBatch",
+                    "sqs:ReceiveMessage",
+                    "sqs:DeleteMessage",
+                    "sqs:DeleteMessageBatch",
+                    "sqs:GetQueueAttributes",
+                    "sqs:GetQueueUrl",
+                ],
+                "Resource": _ANY,
+            }
+        ]
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def no_optional_queues_template(
+    dev_config, mock_sqs_stack_without_optional_queues, mock_opensearch_stack
+):
+    """Template of an IAM stack whose SQS stack has no FIFO or batch queue."""
+    with temp_app() as app:
+        secrets_stack = MockSecretsStack(app, "MockSecretsStack", dev_config)
+        stack = IamStack(
+            app,
+            "TestIamStack",
+            dev_config,
+            rds_stack=SimpleNamespace(secrets_stack=secrets_stack),
+            sqs_stack=mock_sqs_stack_without_optional_queues,
+            opensearch_stack=mock_opensearch_stack,
+        )
+        return assertions.Template.from_stack(stack)
+
+
+def test_iam_stack_creation(iam_stack_template):
     """Test that IAM stack is created successfully."""
-    # Create mock stacks for dependencies
-    from tests.conftest import MockVpcStack, MockSecretsStack
-
-    mock_rds_stack = type("MockRdsStack", (), {"secrets_stack": mock_secrets_stack})()
-
-    mock_sqs_stack = type(
-        "MockSqsStack",
-        (),
-        {
-            "main_queue": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-queue"},
-            )(),
-            "high_priority_queue": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-hp-queue"},
-            )(),
-            "fifo_queue": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-fifo-queue"},
-            )(),
-            "batch_queue": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-batch-queue"},
-            )(),
-            "dlq": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-dlq"},
-            )(),
-        },
-    )()
-
-    mock_opensearch_stack = type(
-        "MockOpenSearchStack",
-        (),
-        {
-            "domain_arn": "arn:aws:es:us-east-1:123456789012:domain/test-domain",
-            "domain": type(
-                "MockDomain",
-                (),
-                {"domain_arn": "arn:aws:es:us-east-1:123456789012:domain/test-domain"},
-            )(),
-        },
-    )()
-
-    stack = IamStack(
-        app,
-        "TestIamStack",
-        dev_config,
-        rds_stack=mock_rds_stack,
-        sqs_stack=mock_sqs_stack,
-        opensearch_stack=mock_opensearch_stack,
-    )
-
-    template = assertions.Template.from_stack(stack)
+    counts = resource_counts(iam_stack_template.to_json()["Resources"])
 
     # Check IAM roles are created
-    template.resource_count_is(
-        "AWS::IAM::Role", 2
-    )  # Lambda execution + Application roles
+    assert counts["AWS::IAM::Role"] == 2  # Lambda execution + Application roles
 
     # Check IAM policies are created
-    template.resource_count_is("AWS::IAM::Policy", 5)  # 5 inline policies
+    assert counts["AWS::IAM::Policy"] == 5  # 5 inline policies
 
 
-def test_lambda_execution_role(app, dev_config, mock_vpc_stack, mock_secrets_stack):
+def test_lambda_execution_role(iam_stack_template):
     """Test that Lambda execution role is created with correct properties."""
-    # Create mock stacks for dependencies
-    mock_rds_stack = type("MockRdsStack", (), {"secrets_stack": mock_secrets_stack})()
-
-    mock_sqs_stack = type(
-        "MockSqsStack",
-        (),
-        {
-            "main_queue": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-queue"},
-            )(),
-            "high_priority_queue": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-hp-queue"},
-            )(),
-            "fifo_queue": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-fifo-queue"},
-            )(),
-            "batch_queue": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-batch-queue"},
-            )(),
-            "dlq": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-dlq"},
-            )(),
-        },
-    )()
-
-    mock_opensearch_stack = type(
-        "MockOpenSearchStack",
-        (),
-        {
-            "domain_arn": "arn:aws:es:us-east-1:123456789012:domain/test-domain",
-            "domain": type(
-                "MockDomain",
-                (),
-                {"domain_arn": "arn:aws:es:us-east-1:123456789012:domain/test-domain"},
-            )(),
-        },
-    )()
-
-    stack = IamStack(
-        app,
-        "TestIamStack",
-        dev_config,
-        rds_stack=mock_rds_stack,
-        sqs_stack=mock_sqs_stack,
-        opensearch_stack=mock_opensearch_stack,
-    )
-
-    template = assertions.Template.from_stack(stack)
-
     # Check Lambda execution role
-    template.has_resource_properties(
+    iam_stack_template.has_resource_properties(
         "AWS::IAM::Role",
-        {
-            "AssumeRolePolicyDocument": {
-                "Statement": [
-                    {
-                        "Effect": "Allow",
-                        "Principal": {"Service": "lambda.amazonaws.com"},
-                        "Action": "sts:AssumeRole",
-                    }
-                ]
-            },
-            "ManagedPolicyArns": assertions.Match.any_value(),
-        },
+        _LAMBDA_ROLE_PROPERTIES,
     )
 
 
-def test_application_role(app, dev_config, mock_vpc_stack, mock_secrets_stack):
+def test_application_role(iam_stack_template):
     """Test that Application role is created with correct properties."""
-    # Create mock stacks for dependencies
-    mock_rds_stack = type("MockRdsStack", (), {"secrets_stack": mock_secrets_stack})()
-
-    mock_sqs_stack = type(
-        "MockSqsStack",
-        (),
-        {
-            "main_queue": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-queue"},
-            )(),
-            "high_priority_queue": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-hp-queue"},
-            )(),
-            "fifo_queue": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-fifo-queue"},
-            )(),
-            "batch_queue": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-batch-queue"},
-            )(),
-            "dlq": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-dlq"},
-            )(),
-        },
-    )()
-
-    mock_opensearch_stack = type(
-        "MockOpenSearchStack",
-        (),
-        {
-            "domain_arn": "arn:aws:es:us-east-1:123456789012:domain/test-domain",
-            "domain": type(
-                "MockDomain",
-                (),
-                {"domain_arn": "arn:aws:es:us-east-1:123456789012:domain/test-domain"},
-            )(),
-        },
-    )()
-
-    stack = IamStack(
-        app,
-        "TestIamStack",
-        dev_config,
-        rds_stack=mock_rds_stack,
-        sqs_stack=mock_sqs_stack,
-        opensearch_stack=mock_opensearch_stack,
-    )
-
-    template = assertions.Template.from_stack(stack)
-
     # Check Application role
-    template.has_resource_properties(
+    iam_stack_template.has_resource_properties(
         "AWS::IAM::Role",
-        {
-            "AssumeRolePolicyDocument": {
-                "Statement": [
-                    {
-                        "Effect": "Allow",
-                        "Principal": {"Service": "ec2.amazonaws.com"},
-                        "Action": "sts:AssumeRole",
-                    },
-                    {
-                        "Effect": "Allow",
-                        "Principal": {"Service": "ecs-tasks.amazonaws.com"},
-                        "Action": "sts:AssumeRole",
-                    },
-                ]
-            },
-        },
+        _APPLICATION_ROLE_PROPERTIES,
     )
 
 
-def test_sqs_access_policy(app, dev_config, mock_vpc_stack, mock_secrets_stack):
+def test_sqs_access_policy(iam_stack_template):
     """Test that SQS access policy has correct permissions."""
-    # Create mock stacks for dependencies
-    mock_rds_stack = type("MockRdsStack", (), {"secrets_stack": mock_secrets_stack})()
-
-    mock_sqs_stack = type(
-        "MockSqsStack",
-        (),
-        {
-            "main_queue": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-queue"},
-            )(),
-            "high_priority_queue": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-hp-queue"},
-            )(),
-            "fifo_queue": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-fifo-queue"},
-            )(),
-            "batch_queue": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-batch-queue"},
-            )(),
-            "dlq": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-dlq"},
-            )(),
-        },
-    )()
-
-    mock_opensearch_stack = type(
-        "MockOpenSearchStack",
-        (),
-        {
-            "domain_arn": "arn:aws:es:us-east-1:123456789012:domain/test-domain",
-            "domain": type(
-                "MockDomain",
-                (),
-                {"domain_arn": "arn:aws:es:us-east-1:123456789012:domain/test-domain"},
-            )(),
-        },
-    )()
-
-    stack = IamStack(
-        app,
-        "TestIamStack",
-        dev_config,
-        rds_stack=mock_rds_stack,
-        sqs_stack=mock_sqs_stack,
-        opensearch_stack=mock_opensearch_stack,
-    )
-
-    template = assertions.Template.from_stack(stack)
-
     # Check SQS access policy
-    template.has_resource_properties(
+    iam_stack_template.has_resource_properties(
         "AWS::IAM::Policy",
-        {
-            "PolicyDocument": {
-                "Statement": [
-                    {
-                        "Effect": "Allow",
-                        "Action": [
-                            "sqs:SendMessage",
-                            "sqs:SendMessageBatch",
-                            "sqs:ReceiveMessage",
-                            "sqs:DeleteMessage",
-                            "sqs:DeleteMessageBatch",
-                            "sqs:GetQueueAttributes",
-                            "sqs:GetQueueUrl",
-                        ],
-                        "Resource": assertions.Match.any_value(),
-                    }
-                ]
-            },
-        },
+        _SQS_ACCESS_POLICY_PROPERTIES,
     )
 
 
-def test_ssm_parameters_created(app, dev_config, mock_vpc_stack, mock_secrets_stack):
+def test_ssm_parameters_created(iam_stack_template):
     """Test that SSM parameters are created."""
-    # Create mock stacks for dependencies
-    mock_rds_stack = type("MockRdsStack", (), {"secrets_stack": mock_secrets_stack})()
-
-    mock_sqs_stack = type(
-        "MockSqsStack",
-        (),
-        {
-            "main_queue": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-queue"},
-            )(),
-            "high_priority_queue": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-hp-queue"},
-            )(),
-            "fifo_queue": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-fifo-queue"},
-            )(),
-            "batch_queue": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-batch-queue"},
-            )(),
-            "dlq": type(
-                "MockQueue",
-                (),
-                {"queue_arn": "arn:aws:sqs:us-east-1:123456789012:test-dlq"},
-            )(),
-        },
-    )()
+    # Check SSM parameters are created
+    iam_stack_template.resource_count_is(
+        "AWS::SSM::Parameter", 9
+    )  # role ARNs + policy ARNs + role names
 
-    mock_opensearch_stack = type(
-        "MockOpenSearchStack",
-        (),
-        {
-            "domain_arn": "arn:aws:es:us-east-1:123456789012:domain/test-domain",
-            "domain": type(
-                "MockDomain",
-                (),
-                {"domain_arn": "arn:aws:es:us-east-1:123456789012:domain/test-domain"},
-            )(),
-        },
-    )()
 
-    stack = IamStack(
-        app,
-        "TestIamStack",
-        dev_config,
-        rds_stack=mock_rds_stack,
-        sqs_stack=mock_sqs_stack,
-        opensearch_stack=mock_opensearch_stack,
-    )
+def test_no_stack_outputs(iam_stack_template):
+    """Test that IAM references are not exported as CloudFormation outputs."""
+    # Check the template has no CloudFormation outputs
+    assert iam_stack_template.find_outputs("*") == {}
 
-    template = assertions.Template.from_stack(stack)
 
-    # Check SSM parameters are created
-    template.resource_count_is(
-        "AWS::SSM::Parameter", 9
-    )  # role ARNs + policy ARNs + role names
+def test_sqs_access_policy_skips_absent_queues(no_optional_queues_template):
+    """Test that absent FIFO and batch queues are left out of the SQS policy."""
+    (policy,) = no_optional_queues_template.find_resources(
+        "AWS::IAM::Policy",
+        {"Properties": {"PolicyName": "aws-cdk-infra-sqs-access-policy-dev"}},
+    ).values()
+    (statement,) = policy["Properties"]["PolicyDocument"]["Statement"]
+    assert statement["Resource"] == [
+        "arn:aws:sqs:us-east-1:123456789012:test-queue",
+        "arn:aws:sqs:us-east-1:123456789012:test-hp-queue",
+        "arn:aws:sqs:us-east-1:123456789012:test-dlq",
+    ]
@@ -4,150 +4,157 @@ Unit tests for OpenSearch stack.
 
 import pytest
 from aws_cdk import assertions
-from aws_cdk import aws_opensearchservice as opensearch
 
 from infra.stacks.opensearch_stack import OpenSearchStack
+from tests.conftest import (
+    MockVpcStack,
+    resource_counts,
+    resource_has,
+    temp_app,
+)
+
+# Domain properties expected in the dev template
+OPENSEARCH_DOMAIN_CASES = [
+    pytest.param({"EngineVersion": "OpenSearch_2.11"}, id="version"),
+    pytest.param(
+        {
+            "EncryptionAtRestOptions": {"Enabled": True},
+            "NodeToNodeEncryptionOptions": {"Enabled": True},
+        },
+        id="encryption",
+    ),
+]
 
 
-def test_opensearch_stack_creation(app, dev_config, mock_vpc_stack):
-    """Test that OpenSearch stack is created successfully."""
-    stack = OpenSearchStack(
-        app, "TestOpenSearchStack", dev_config, vpc_stack=mock_vpc_stack
-    )
-
-    template = assertions.Template.from_stack(stack)
-
-    # Check OpenSearch domain is created
-    template.resource_count_is("AWS::OpenSearch::Domain", 1)
-
-    # Check KMS key is created
-    template.resource_count_is("AWS::KMS::Key", 1)
+def _synth_opensearch_stack(config):
+    """Synthesize an OpenSearch stack and its mock dependencies in a fresh app."""
+    with temp_app() as app:
+        vpc_stack = MockVpcStack(app, "MockVpcStack", config, minimal=True)
+        stack = OpenSearchStack(
+            app,
+            "TestOpenSearchStack",
+            config,
+            vpc_stack=vpc_stack,
+        )
+        return assertions.Template.from_stack(stack)
 
-    # Check log group is created
-    template.resource_count_is("AWS::Logs::LogGroup", 1)
 
+@pytest.fixture(scope="module")
+def dev_template(dev_config):
+    """Template of a dev OpenSearch stack, synthesized once per module."""
+    return _synth_opensearch_stack(dev_config)
 
-def test_opensearch_version(app, dev_config, mock_vpc_stack):
-    """Test that OpenSearch version is correct."""
-    stack = OpenSearchStack(
-        app, "TestOpenSearchStack", dev_config, vpc_stack=mock_vpc_stack
-    )
 
-    template = assertions.Template.from_stack(stack)
+@pytest.fixture(scope="module")
+def prod_template(prod_config):
+    """Template of a prod OpenSearch stack, synthesized once per module."""
+    return _synth_opensearch_stack(prod_config)
 
-    # Check OpenSearch version
-    template.has_resource_properties(
-        "AWS::OpenSearch::Domain",
-        {
-            "EngineVersion": "OpenSearch_2.11",
-        },
-    )
 
+def test_opensearch_stack_creation(dev_resources):
+    """Test that OpenSearch stack is created successfully."""
+    counts = resource_counts(dev_resources)
 
-def test_opensearch_capacity_dev(app, dev_config, mock_vpc_stack):
-    """Test OpenSearch capacity configuration for dev."""
-    stack = OpenSearchStack(
-        app, "TestOpenSearchStack", dev_config, vpc_stack=mock_vpc_stack
-    )
+    # Check OpenSearch domain is created
+    assert counts["AWS::OpenSearchService::Domain"] == 1
 
-    template = assertions.Template.from_stack(stack)
+    # Check the stack-local KMS key is created
+    assert counts["AWS::KMS::Key"] == 1
 
-    # Check capacity configuration for dev
-    template.has_resource_properties(
-        "AWS::OpenSearch::Domain",
-        {
-            "ClusterConfig": {
-                "InstanceCount": 1,
-                "InstanceType": "t3.small.search",
-            },
-        },
-    )
+    # Check log group is created
+    assert counts["AWS::Logs::LogGroup"] == 1
 
 
-def test_opensearch_capacity_prod(app, prod_config, mock_vpc_stack):
-    """Test OpenSearch capacity configuration for prod."""
-    stack = OpenSearchStack(
-        app, "TestOpenSearchStackProd", prod_config, vpc_stack=mock_vpc_stack
+@pytest.mark.parametrize("expected_properties", OPENSEARCH_DOMAIN_CASES)
+def test_opensearch_domain_properties(dev_resources, expected_properties):
+    """Test the OpenSearch version and encryption settings."""
+    assert resource_has(
+        dev_resources, "AWS::OpenSearchService::Domain", expected_properties
     )
 
-    template = assertions.Template.from_stack(stack)
 
-    # Check capacity configuration for prod
-    template.has_resource_properties(
-        "AWS::OpenSearch::Domain",
-        {
-            "ClusterConfig": {
+@pytest.mark.parametrize(
+    "resources_name,cluster_config",
+    [
+        pytest.param(
+            "dev_resources",
+            {"InstanceCount": 1, "InstanceType": "t3.small.search"},
+            id="dev",
+        ),
+        pytest.param(
+            "prod_resources",
+            {
                 "InstanceCount": 3,
                 "InstanceType": "r6g.large.search",
                 "MultiAZWithStandbyEnabled": True,
             },
-        },
-    )
-
-
-def test_opensearch_encryption(app, dev_config, mock_vpc_stack):
-    """Test that encryption is enabled."""
-    stack = OpenSearchStack(
-        app, "TestOpenSearchStack", dev_config, vpc_stack=mock_vpc_stack
+            id="prod",
+        ),
+    ],
+)
+def test_opensearch_capacity(request, resources_name, cluster_config):
+    """Test OpenSearch capacity configuration for each environment."""
+    resources = request.getfixturevalue(resources_name)
+    assert resource_has(
+        resources,
+        "AWS::OpenSearchService::Domain",
+        {"ClusterConfig": cluster_config},
     )
 
-    template = assertions.Template.from_stack(stack)
 
-    # Check encryption is enabled
-    template.has_resource_properties(
-        "AWS::OpenSearch::Domain",
+def test_opensearch_master_password_dynamic_reference(dev_template):
+    """Test that the master password is resolved by CloudFormation, not at synth."""
+    # Check the password is a Secrets Manager dynamic reference
+    dev_template.has_resource_properties(
+        "AWS::OpenSearchService::Domain",
         {
-            "EncryptionAtRestOptions": {
-                "Enabled": True,
-            },
-            "NodeToNodeEncryptionOptions": {
-                "Enabled": True,
+            "AdvancedSecurityOptions": {
+                "MasterUserOptions": {
+                    "MasterUserPassword": {
+                        "Fn::Join": [
+                            "",
+                            [
+                                "{{resolve:secretsmanager:",
+                                assertions.Match.any_value(),
+                                ":SecretString:password::}}",
+                            ],
+                        ],
+                    },
+                },
             },
         },
     )
 
 
-def test_opensearch_vpc_configuration(app, dev_config, mock_vpc_stack):
-    """Test that VPC configuration is correct."""
-    stack = OpenSearchStack(
-        app, "TestOpenSearchStack", dev_config, vpc_stack=mock_vpc_stack
-    )
-
-    template = assertions.Template.from_stack(stack)
-
-    # Check VPC configuration
-    template.has_resource_properties(
-        "AWS::OpenSearch::Domain",
-        {
-            "VPCOptions": assertions.Match.any_value(),
-        },
-    )
+def test_opensearch_encryption_uses_stack_kms_key(dev_template):
+    """Test that the domain is encrypted at rest with the stack's own KMS key."""
+    # Changing the domain's KmsKeyId forces replacement, so it must stay on this key
+    (key_id,) = dev_template.find_resources("AWS::KMS::Key")
+    (domain,) = dev_template.find_resources("AWS::OpenSearchService::Domain").values()
+    assert key_id.startswith("OpenSearchKmsKey")
+    assert domain["Properties"]["EncryptionAtRestOptions"]["KmsKeyId"] == {
+        "Ref": key_id
+    }
 
 
-def test_opensearch_logging(app, dev_config, mock_vpc_stack):
-    """Test that logging is configured."""
-    stack = OpenSearchStack(
-        app, "TestOpenSearchStack", dev_config, vpc_stack=mock_vpc_stack
-    )
-
-    template = assertions.Template.from_stack(stack)
+def test_opensearch_vpc_and_logging_configured(dev_template, dev_resources):
+    """Test that the domain is placed in the VPC and publishes logs."""
+    # Existence-only checks read the domain properties directly
+    (domain,) = dev_template.find_resources("AWS::OpenSearchService::Domain").values()
+    assert "VPCOptions" in domain["Properties"]
+    assert "LogPublishingOptions" in domain["Properties"]
 
-    # Check logging configuration
-    template.has_resource_properties(
-        "AWS::OpenSearch::Domain",
-        {
-            "LogPublishingOptions": assertions.Match.any_value(),
-        },
-    )
+    # Check log group access uses a native resource policy (no custom resource)
+    counts = resource_counts(dev_resources)
+    assert counts["AWS::Logs::ResourcePolicy"] == 1
+    assert counts["AWS::Lambda::Function"] == 0
 
 
-def test_ssm_parameters_created(app, dev_config, mock_vpc_stack):
+def test_ssm_parameters_created(dev_template):
     """Test that SSM parameters are created."""
-    stack = OpenSearchStack(
-        app, "TestOpenSearchStack", dev_config, vpc_stack=mock_vpc_stack
+    # Check a single aggregated SSM parameter is created
+    dev_template.resource_count_is("AWS::SSM::Parameter", 1)
+    dev_template.has_resource_properties(
+        "AWS::SSM::Parameter",
+        {"Name": "/infra/dev/opensearch/outputs"},
     )
-
-    template = assertions.Template.from_stack(stack)
-
-    # Check SSM parameters are created
-    template.resource_count_is("AWS::SSM::Parameter", 8)  # endpoints, ARNs, etc.
@@ -4,165 +4,103 @@ Unit tests for RDS stack.
 
 import pytest
 from aws_cdk import assertions
-from aws_cdk import aws_rds as rds
 
 from infra.stacks.rds_stack import RdsStack
-
-
-def test_rds_stack_creation(app, dev_config, mock_vpc_stack, mock_secrets_stack):
+from tests.conftest import (
+    MockSecretsStack,
+    MockVpcStack,
+    resource_counts,
+    resource_has,
+    temp_app,
+)
+
+# DB cluster properties expected in the dev template
+RDS_CLUSTER_CASES = [
+    pytest.param(
+        {"Engine": "aurora-mysql", "EngineVersion": "8.0.mysql_aurora.3.02.0"},
+        id="aurora-mysql-engine",
+    ),
+    pytest.param(
+        {"ServerlessV2ScalingConfiguration": {"MinCapacity": 0.5, "MaxCapacity": 2.0}},
+        id="serverless-v2",
+    ),
+    pytest.param({"StorageEncrypted": True}, id="encryption"),
+    pytest.param({"BackupRetentionPeriod": 7}, id="backup-retention"),  # dev config
+]
+
+
+def _synth_rds_stack(config):
+    """Synthesize an RDS stack and its mock dependencies in a fresh app."""
+    with temp_app() as app:
+        vpc_stack = MockVpcStack(app, "MockVpcStack", config)
+        secrets_stack = MockSecretsStack(app, "MockSecretsStack", config)
+        stack = RdsStack(
+            app,
+            "TestRdsStack",
+            config,
+            vpc_stack=vpc_stack,
+            secrets_stack=secrets_stack,
+        )
+        return assertions.Template.from_stack(
+            stack, skip_cyclical_dependencies_check=True
+        )
+
+
+@pytest.fixture(scope="module")
+def dev_template(dev_config):
+    """Template of a dev RDS stack, synthesized once per module."""
+    return _synth_rds_stack(dev_config)
+
+
+@pytest.fixture(scope="module")
+def prod_template(prod_config):
+    """Template of a prod RDS stack, synthesized once per module."""
+    return _synth_rds_stack(prod_config)
+
+
+def test_rds_stack_creation(dev_resources):
     """Test that RDS stack is created successfully."""
-    stack = RdsStack(
-        app,
-        "TestRdsStack",
-        dev_config,
-        vpc_stack=mock_vpc_stack,
-        secrets_stack=mock_secrets_stack,
-    )
-
-    template = assertions.Template.from_stack(
-        stack, skip_cyclical_dependencies_check=True
-    )
+    counts = resource_counts(dev_resources)
 
     # Check Aurora cluster is created
-    template.resource_count_is("AWS::RDS::DBCluster", 1)
-
-    # Check DB instances are created
-    template.resource_count_is("AWS::RDS::DBInstance", 2)  # 1 writer + 1 reader for dev
+    assert counts["AWS::RDS::DBCluster"] == 1
 
     # Check subnet group is created
-    template.resource_count_is("AWS::RDS::DBSubnetGroup", 1)
+    assert counts["AWS::RDS::DBSubnetGroup"] == 1
 
     # Check parameter group is created
     # template.resource_count_is("AWS::RDS::DBParameterGroup", 1)
 
 
-def test_rds_stack_prod_config(app, prod_config, mock_vpc_stack, mock_secrets_stack):
-    """Test RDS stack with production configuration."""
-    stack = RdsStack(
-        app,
-        "TestRdsStackProd",
-        prod_config,
-        vpc_stack=mock_vpc_stack,
-        secrets_stack=mock_secrets_stack,
-    )
-
-    template = assertions.Template.from_stack(
-        stack, skip_cyclical_dependencies_check=True
-    )
-
-    # Check DB instances are created (1 writer + 1 read replica for prod)
-    template.resource_count_is("AWS::RDS::DBInstance", 2)
-
-
-def test_aurora_mysql_engine(app, dev_config, mock_vpc_stack, mock_secrets_stack):
-    """Test that Aurora MySQL engine is configured correctly."""
-    stack = RdsStack(
-        app,
-        "TestRdsStack",
-        dev_config,
-        vpc_stack=mock_vpc_stack,
-        secrets_stack=mock_secrets_stack,
-    )
-
-    template = assertions.Template.from_stack(
-        stack, skip_cyclical_dependencies_check=True
-    )
-
-    # Check Aurora MySQL engine
-    template.has_resource_properties(
-        "AWS::RDS::DBCluster",
-        {
-            "Engine": "aurora-mysql",
-            "EngineVersion": "8.0.mysql_aurora.3.02.0",
-        },
-    )
-
-
-def test_serverless_v2_config(app, dev_config, mock_vpc_stack, mock_secrets_stack):
-    """Test that Serverless v2 configuration is applied."""
-    stack = RdsStack(
-        app,
-        "TestRdsStack",
-        dev_config,
-        vpc_stack=mock_vpc_stack,
-        secrets_stack=mock_secrets_stack,
-    )
-
-    template = assertions.Template.from_stack(
-        stack, skip_cyclical_dependencies_check=True
-    )
-
-    # Check Serverless v2 scaling configuration
-    template.has_resource_properties(
-        "AWS::RDS::DBCluster",
-        {
-            "ServerlessV2ScalingConfiguration": {
-                "MinCapacity": 0.5,
-                "MaxCapacity": 2.0,
-            },
-        },
-    )
-
-
-def test_encryption_enabled(app, dev_config, mock_vpc_stack, mock_secrets_stack):
-    """Test that encryption is enabled."""
-    stack = RdsStack(
-        app,
-        "TestRdsStack",
-        dev_config,
-        vpc_stack=mock_vpc_stack,
-        secrets_stack=mock_secrets_stack,
-    )
-
-    template = assertions.Template.from_stack(
-        stack, skip_cyclical_dependencies_check=True
-    )
-
-    # Check encryption is enabled
-    template.has_resource_properties(
-        "AWS::RDS::DBCluster",
-        {
-            "StorageEncrypted": True,
-        },
-    )
-
-
-def test_backup_configuration(app, dev_config, mock_vpc_stack, mock_secrets_stack):
-    """Test that backup configuration is correct."""
-    stack = RdsStack(
-        app,
-        "TestRdsStack",
-        dev_config,
-        vpc_stack=mock_vpc_stack,
-        secrets_stack=mock_secrets_stack,
-    )
-
-    template = assertions.Template.from_stack(
-        stack, skip_cyclical_dependencies_check=True
-    )
-
-    # Check backup retention
-    template.has_resource_properties(
-        "AWS::RDS::DBCluster",
-        {
-            "BackupRetentionPeriod": 7,  # dev config
-        },
-    )
-
-
-def test_ssm_parameters_created(app, dev_config, mock_vpc_stack, mock_secrets_stack):
-    """Test that SSM parameters are created."""
-    stack = RdsStack(
-        app,
-        "TestRdsStack",
-        dev_config,
-        vpc_stack=mock_vpc_stack,
-        secrets_stack=mock_secrets_stack,
-    )
-
-    template = assertions.Template.from_stack(
-        stack, skip_cyclical_dependencies_check=True
-    )
+@pytest.mark.parametrize(
+    "template_name,expected_count",
+    [
+        pytest.param("dev_template", 2, id="dev"),  # 1 writer + 1 reader
+        pytest.param("prod_template", 2, id="prod"),  # 1 writer + 1 read replica
+    ],
+)
+def test_db_instances(request, template_name, expected_count):
+    """Test the DB instance count for each environment."""
+    template = request.getfixturevalue(template_name)
+    template.resource_count_is("AWS::RDS::DBInstance", expected_count)
+
 
+@pytest.mark.parametrize("expected_properties", RDS_CLUSTER_CASES)
+def test_cluster_properties(dev_resources, expected_properties):
+    """Test the Aurora engine, Serverless v2 scaling, encryption and backups."""
+    assert resource_has(dev_resources, "AWS::RDS::DBCluster", expected_properties)
+
+
+def test_cluster_storage_uses_stack_kms_key(dev_template):
+    """Test that the cluster storage is encrypted with the stack's own KMS key."""
+    # Changing the cluster's KmsKeyId forces replacement, so it must stay on this key
+    (key_id,) = dev_template.find_resources("AWS::KMS::Key")
+    (cluster,) = dev_template.find_resources("AWS::RDS::DBCluster").values()
+    assert key_id.startswith("RdsKmsKey")
+    assert cluster["Properties"]["KmsKeyId"] == {"Fn::GetAtt": [key_id, "Arn"]}
+
+
+def test_ssm_parameters_created(dev_template):
+    """Test that SSM parameters are created."""
     # Check SSM parameters are created
-    template.resource_count_is("AWS::SSM::Parameter", 8)  # endpoints, ARNs, etc.
+    dev_template.resource_count_is("AWS::SSM::Parameter", 8)  # endpoints, ARNs, etc.
@@ -4,34 +4,50 @@ Unit tests for Secrets stack.
 
 import pytest
 from aws_cdk import assertions
-from aws_cdk import aws_secretsmanager as secretsmanager
 
 from infra.stacks.secrets_stack import SecretsStack
+from tests.conftest import resource_counts, temp_app
 
 
-def test_secrets_stack_creation(app, dev_config):
-    """Test that Secrets stack is created successfully."""
-    stack = SecretsStack(app, "TestSecretsStack", dev_config)
+@pytest.fixture(scope="module")
+def secrets_stack(module_app, dev_config):
+    """Create a dev Secrets stack shared by the tests in this module."""
+    return SecretsStack(module_app, "TestSecretsStack", dev_config)
+
+
+@pytest.fixture(scope="module")
+def dev_template(secrets_stack, synthed_assembly):
+    """Template of the shared dev stack, read from the module's cloud assembly."""
+    return assertions.Template.from_json(
+        synthed_assembly.get_stack_by_name(secrets_stack.stack_name).template
+    )
+
+
+@pytest.fixture(scope="module")
+def prod_template(prod_config):
+    """Template of a prod Secrets stack, synthesized once in a fresh app."""
+    with temp_app() as app:
+        stack = SecretsStack(app, "TestSecretsStackProd", prod_config)
+        yield assertions.Template.from_stack(stack)
+
 
-    template = assertions.Template.from_stack(stack)
+def test_secrets_stack_creation(dev_resources):
+    """Test that Secrets stack is created successfully."""
+    counts = resource_counts(dev_resources)
 
     # Check secrets are created
-    template.resource_count_is("AWS::SecretsManager::Secret", 4)
+    assert counts["AWS::SecretsManager::Secret"] == 4
 
     # Check KMS key is created
-    template.resource_count_is(
-        "AWS::KMS::Key", 2
-    )  # Secrets KMS key + SSM outputs KMS key
+    assert (
+        counts["AWS::KMS::Key"] == 1
+    )  # Secrets KMS key (SSM outputs key is only created for secure strings)
 
 
-def test_rds_credentials_secret(app, dev_config):
+def test_rds_credentials_secret(dev_template):
     """Test that RDS credentials secret is created with correct properties."""
-    stack = SecretsStack(app, "TestSecretsStack", dev_config)
-
-    template = assertions.Template.from_stack(stack)
-
     # Check RDS credentials secret
-    template.has_resource_properties(
+    dev_template.has_resource_properties(
         "AWS::SecretsManager::Secret",
         {
             "GenerateSecretString": {
@@ -44,48 +60,30 @@ def test_rds_credentials_secret(app, dev_config):
     )
 
 
-def test_secrets_encryption(app, dev_config):
+def test_secrets_encryption(dev_template):
     """Test that secrets are encrypted with KMS."""
-    stack = SecretsStack(app, "TestSecretsStack", dev_config)
-
-    template = assertions.Template.from_stack(stack)
-
-    # Check that secrets have KMS key reference
-    template.has_resource_properties(
-        "AWS::SecretsManager::Secret",
-        {
-            "KmsKeyId": assertions.Match.any_value(),
-        },
-    )
-
-
-def test_secrets_rotation_prod(app, prod_config):
-    """Test that secrets rotation is enabled in production."""
-    stack = SecretsStack(app, "TestSecretsStackProd", prod_config)
-
-    template = assertions.Template.from_stack(stack)
-
-    # Check rotation schedule is created for prod
-    template.resource_count_is("AWS::SecretsManager::RotationSchedule", 1)
-
-
-def test_secrets_rotation_dev(app, dev_config):
-    """Test that secrets rotation is disabled in dev."""
-    stack = SecretsStack(app, "TestSecretsStackDev", dev_config)
-
-    template = assertions.Template.from_stack(stack)
-
-    # Check rotation schedule is NOT created for dev
-    template.resource_count_is("AWS::SecretsManager::RotationSchedule", 0)
-
-
-def test_ssm_parameters_created(app, dev_config):
+    # Check that every secret has a KMS key reference
+    secrets = dev_template.find_resources("AWS::SecretsManager::Secret")
+    assert secrets
+    assert all("KmsKeyId" in secret["Properties"] for secret in secrets.values())
+
+
+@pytest.mark.parametrize(
+    "template_name,expected_count",
+    [
+        pytest.param("dev_template", 0, id="dev"),  # rotation disabled
+        pytest.param("prod_template", 1, id="prod"),  # rotation enabled
+    ],
+)
+def test_secrets_rotation(request, template_name, expected_count):
+    """Test that secrets rotation is only enabled in production."""
+    template = request.getfixturevalue(template_name)
+    template.resource_count_is("AWS::SecretsManager::RotationSchedule", expected_count)
+
+
+def test_ssm_parameters_created(dev_template):
     """Test that SSM parameters are created for secrets."""
-    stack = SecretsStack(app, "TestSecretsStack", dev_config)
-
-    template = assertions.Template.from_stack(stack)
-
     # Check SSM parameters are created
-    template.resource_count_is(
+    dev_template.resource_count_is(
         "AWS::SSM::Parameter", 9
     )  # 4 ARNs + 4 names + 1 KMS key ARN
@@ -4,49 +4,73 @@ Unit tests for SQS stack.
 
 import pytest
 from aws_cdk import assertions
-from aws_cdk import aws_sqs as sqs
 
 from infra.stacks.sqs_stack import SqsStack
+from tests.conftest import resource_counts, resource_has, temp_app
 
 
-def test_sqs_stack_creation(app, dev_config):
-    """Test that SQS stack is created successfully."""
-    stack = SqsStack(app, "TestSqsStack", dev_config)
+@pytest.fixture(scope="module")
+def sqs_stack(module_app, dev_config):
+    """Create a dev SQS stack shared by the tests in this module."""
+    return SqsStack(module_app, "TestSqsStack", dev_config)
+
+
+@pytest.fixture(scope="module")
+def dev_template(sqs_stack, synthed_assembly):
+    """Template of the shared dev stack, read from the module's cloud assembly."""
+    return assertions.Template.from_json(
+        synthed_assembly.get_stack_by_name(sqs_stack.stack_name).template
+    )
 
-    template = assertions.Template.from_stack(stack)
+
+@pytest.fixture(scope="module")
+def prod_template(prod_config):
+    """Template of a prod SQS stack, synthesized once in a fresh app."""
+    with temp_app() as app:
+        stack = SqsStack(app, "TestSqsStackProd", prod_config)
+        yield assertions.Template.from_stack(stack)
+
+
+def test_sqs_stack_creation(dev_resources):
+    """Test that SQS stack is created successfully."""
+    counts = resource_counts(dev_resources)
 
     # Check queues are created
-    template.resource_count_is(
-        "AWS::SQS::Queue", 5
-    )  # main, high-priority, fifo, batch, dlq
+    assert (
+        counts["AWS::SQS::Queue"] == 3
+    )  # main, high-priority, dlq (fifo and batch are disabled in dev)
 
     # Check KMS key is created
-    template.resource_count_is("AWS::KMS::Key", 2)  # SQS KMS key + SSM outputs KMS key
+    assert counts["AWS::KMS::Key"] == 1  # SQS KMS key (SSM key is lazy)
 
 
-def test_queue_encryption(app, dev_config):
+def test_queue_encryption(dev_template):
     """Test that queues are encrypted with KMS."""
-    stack = SqsStack(app, "TestSqsStack", dev_config)
-
-    template = assertions.Template.from_stack(stack)
-
-    # Check that queues have KMS encryption
-    template.has_resource_properties(
+    # Check that queues have KMS encryption with data key reuse
+    dev_template.has_resource_properties(
         "AWS::SQS::Queue",
         {
+            "QueueName": "aws-cdk-infra-main-queue-dev",
             "KmsMasterKeyId": assertions.Match.any_value(),
+            "KmsDataKeyReusePeriodSeconds": 86400,
         },
     )
 
+    # Check that the low-sensitivity DLQ uses SQS-managed encryption
+    dev_template.has_resource_properties(
+        "AWS::SQS::Queue",
+        {
+            "QueueName": "aws-cdk-infra-dlq-dev",
+            "SqsManagedSseEnabled": True,
+            "KmsMasterKeyId": assertions.Match.absent(),
+        },
+    )
 
-def test_dlq_configuration(app, dev_config):
-    """Test that Dead Letter Queue is configured correctly."""
-    stack = SqsStack(app, "TestSqsStack", dev_config)
-
-    template = assertions.Template.from_stack(stack)
 
+def test_dlq_configuration(dev_template):
+    """Test that Dead Letter Queue is configured correctly."""
     # Check DLQ properties
-    template.has_resource_properties(
+    dev_template.has_resource_properties(
         "AWS::SQS::Queue",
         {
             "MessageRetentionPeriod": 1209600,  # 14 days
@@ -54,14 +78,25 @@ def test_dlq_configuration(app, dev_config):
     )
 
 
-def test_fifo_queue_properties(app, dev_config):
-    """Test that FIFO queue has correct properties."""
-    stack = SqsStack(app, "TestSqsStack", dev_config)
+def test_optional_queues_disabled_in_dev(dev_template):
+    """Test that the FIFO and batch queues are not created in dev."""
+    dev_template.resource_properties_count_is("AWS::SQS::Queue", {"FifoQueue": True}, 0)
+    dev_template.resource_properties_count_is(
+        "AWS::SQS::Queue", {"QueueName": "aws-cdk-infra-batch-queue-dev"}, 0
+    )
+
+
+def test_optional_queues_prod(prod_template, prod_resources):
+    """Test that the FIFO and batch queues and DLQ age alarm are created in prod."""
+    counts = resource_counts(prod_resources)
 
-    template = assertions.Template.from_stack(stack)
+    # Check all queues and the separate DLQ messages and age alarms are created
+    assert counts["AWS::SQS::Queue"] == 5  # main, high-priority, fifo, batch, dlq
+    assert counts["AWS::CloudWatch::Alarm"] == 2
 
     # Check FIFO queue properties
-    template.has_resource_properties(
+    assert resource_has(
+        prod_resources,
         "AWS::SQS::Queue",
         {
             "FifoQueue": True,
@@ -69,26 +104,46 @@ def test_fifo_queue_properties(app, dev_config):
         },
     )
 
+    # Check that the low-sensitivity batch queue uses SQS-managed encryption
+    prod_template.has_resource_properties(
+        "AWS::SQS::Queue",
+        {
+            "QueueName": "aws-cdk-infra-batch-queue-prod",
+            "SqsManagedSseEnabled": True,
+            "KmsMasterKeyId": assertions.Match.absent(),
+        },
+    )
 
-def test_cloudwatch_alarms(app, dev_config):
-    """Test that CloudWatch alarms are created for DLQ."""
-    stack = SqsStack(app, "TestSqsStack", dev_config)
+    # Check SSM parameters include the optional resources
+    assert counts["AWS::SSM::Parameter"] == 13
 
-    template = assertions.Template.from_stack(stack)
 
+def test_cloudwatch_alarms(dev_template):
+    """Test that CloudWatch alarms are created for DLQ."""
     # Check CloudWatch alarms are created
-    template.resource_count_is(
-        "AWS::CloudWatch::Alarm", 2
-    )  # DLQ messages and age alarms
+    dev_template.resource_count_is(
+        "AWS::CloudWatch::Alarm", 1
+    )  # Combined DLQ messages/age alarm outside prod
 
+    # Check the combined alarm is driven by a metric math expression
+    dev_template.has_resource_properties(
+        "AWS::CloudWatch::Alarm",
+        {
+            "AlarmName": "aws-cdk-infra-dlq-combined-alarm-dev",
+            "Metrics": assertions.Match.array_with(
+                [
+                    assertions.Match.object_like(
+                        {"Expression": "IF(messages > 0 OR age > 3600, 1, 0)"}
+                    )
+                ]
+            ),
+        },
+    )
 
-def test_ssm_parameters_created(app, dev_config):
-    """Test that SSM parameters are created."""
-    stack = SqsStack(app, "TestSqsStack", dev_config)
-
-    template = assertions.Template.from_stack(stack)
 
+def test_ssm_parameters_created(dev_template):
+    """Test that SSM parameters are created."""
     # Check SSM parameters are created
-    template.resource_count_is(
-        "AWS::SSM::Parameter", 13
-    )  # URLs + ARNs + KMS key + alarms
+    dev_template.resource_count_is(
+        "AWS::SSM::Parameter", 8
+    )  # 3 URLs + 3 ARNs + KMS key + DLQ alarm
@@ -0,0 +1,77 @@
+"""
+Unit tests for SSM outputs construct.
+"""
+
+from aws_cdk import Stack, assertions
+
+from infra.constructs.ssm_outputs import SsmOutputs
+
+
+def test_kms_key_not_created_for_plain_parameters(app, dev_config):
+    """Test that plain parameters do not create an SSM KMS key."""
+    stack = Stack(app, "TestSsmOutputsStack")
+    ssm_outputs = SsmOutputs(stack, "SsmOutputs", dev_config, stack_name="test")
+    ssm_outputs.create_parameter_and_output("queue-url", "https://example.com")
+
+    template = assertions.Template.from_stack(stack)
+
+    template.resource_count_is("AWS::SSM::Parameter", 1)
+    template.resource_count_is("AWS::KMS::Key", 0)
+
+
+def test_kms_key_not_created_for_secure_parameters(app, dev_config):
+    """Test that secure string parameters do not create an unused SSM KMS key."""
+    stack = Stack(app, "TestSsmOutputsStack")
+    ssm_outputs = SsmOutputs(stack, "SsmOutputs", dev_config, stack_name="test")
+    ssm_outputs.create_secure_string_parameter("token", "value")
+    ssm_outputs.create_secure_string_parameter("other-token", "value")
+
+    template = assertions.Template.from_stack(stack)
+
+    # The parameters cannot reference a customer managed key, so none is created
+    template.resource_count_is("AWS::KMS::Key", 0)
+    template.resource_properties_count_is(
+        "AWS::SSM::Parameter", {"Type": "SecureString"}, 2
+    )
+
+
+def test_create_parameters_bulk(app, dev_config):
+    """Test that bulk creation publishes a parameter and output per entry."""
+    stack = Stack(app, "TestSsmOutputsStack")
+    ssm_outputs = SsmOutputs(stack, "SsmOutputs", dev_config, stack_name="test")
+    results = ssm_outputs.create_parameters_bulk(
+        {
+            "queue-url": ("https://example.com", "Queue URL"),
+            "queue-arn": ("arn:aws:sqs:ap-southeast-2:123456789012:q", None),
+        }
+    )
+
+    template = assertions.Template.from_stack(stack)
+
+    assert list(results) == ["queue-url", "queue-arn"]
+    template.resource_count_is("AWS::SSM::Parameter", 2)
+    template.has_resource_properties(
+        "AWS::SSM::Parameter",
+        {"Name": "/infra/dev/test/queue-url", "Description": "Queue URL"},
+    )
+    assert len(template.find_outputs("*")) == 2
+
+
+def test_create_aggregated_parameter(app, dev_config):
+    """Test that aggregated values are published as one JSON parameter."""
+    stack = Stack(app, "TestSsmOutputsStack")
+    ssm_outputs = SsmOutputs(stack, "SsmOutputs", dev_config, stack_name="test")
+    ssm_outputs.create_aggregated_parameter(
+        "outputs", {"domain-name": "search", "master-username": "admin"}
+    )
+
+    template = assertions.Template.from_stack(stack)
+
+    template.resource_count_is("AWS::SSM::Parameter", 1)
+    template.has_resource_properties(
+        "AWS::SSM::Parameter",
+        {
+            "Name": "/infra/dev/test/outputs",
+            "Value": '{"domain-name":"search","master-username":"admin"}',
+        },
+    )
@@ -4,19 +4,37 @@ Unit tests for VPC stack.
 
 import pytest
 from aws_cdk import assertions
-from aws_cdk import aws_ec2 as ec2
 
 from infra.stacks.vpc_stack import VpcStack
+from tests.conftest import temp_app
 
 
-def test_vpc_stack_creation(app, dev_config):
-    """Test that VPC stack is created successfully."""
-    stack = VpcStack(app, "TestVpcStack", dev_config)
+@pytest.fixture(scope="module")
+def vpc_stack(module_app, dev_config):
+    """Create a dev VPC stack shared by the tests in this module."""
+    return VpcStack(module_app, "TestVpcStack", dev_config)
+
+
+@pytest.fixture(scope="module")
+def dev_template(vpc_stack, synthed_assembly):
+    """Template of the shared dev stack, read from the module's cloud assembly."""
+    return assertions.Template.from_json(
+        synthed_assembly.get_stack_by_name(vpc_stack.stack_name).template
+    )
 
-    template = assertions.Template.from_stack(stack)
 
+@pytest.fixture(scope="module")
+def prod_template(prod_config):
+    """Template of a prod VPC stack, synthesized once in a fresh app."""
+    with temp_app() as app:
+        stack = VpcStack(app, "TestVpcStackProd", prod_config)
+        yield assertions.Template.from_stack(stack)
+
+
+def test_vpc_stack_creation(dev_template):
+    """Test that VPC stack is created successfully."""
     # Check VPC is created
-    template.has_resource_properties(
+    dev_template.has_resource_properties(
         "AWS::EC2::VPC",
         {
             "CidrBlock": "10.0.0.0/16",
@@ -26,59 +44,76 @@ def test_vpc_stack_creation(app, dev_config):
     )
 
     # Check security groups are created
-    template.resource_count_is("AWS::EC2::SecurityGroup", 6)  # 5 custom + 1 default
-
-    # Check NAT gateways (1 for dev)
-    template.resource_count_is("AWS::EC2::NatGateway", 1)
-
-
-def test_vpc_stack_prod_config(app, prod_config):
-    """Test VPC stack with production configuration."""
-    stack = VpcStack(app, "TestVpcStackProd", prod_config)
-
-    template = assertions.Template.from_stack(stack)
-
-    # Check NAT gateways (2 for prod with 2 AZs)
-    template.resource_count_is("AWS::EC2::NatGateway", 2)
+    dev_template.resource_count_is("AWS::EC2::SecurityGroup", 6)  # 5 custom + 1 default
+
+
+@pytest.mark.parametrize(
+    "template_name,expected_count",
+    [
+        pytest.param("dev_template", 1, id="dev"),  # single NAT gateway
+        pytest.param("prod_template", 2, id="prod"),  # one per AZ (2 AZs)
+    ],
+)
+def test_nat_gateways(request, template_name, expected_count):
+    """Test the NAT gateway count for each environment."""
+    template = request.getfixturevalue(template_name)
+    template.resource_count_is("AWS::EC2::NatGateway", expected_count)
+
+
+def test_vpc_flow_logs_prod(prod_template):
+    """Test VPC flow logs with production configuration."""
+    # Check flow logs are delivered to CloudWatch Logs outside dev
+    prod_template.has_resource_properties(
+        "AWS::EC2::FlowLog",
+        {"LogDestinationType": "cloud-watch-logs"},
+    )
+    prod_template.has_resource_properties(
+        "AWS::Logs::LogGroup",
+        {"RetentionInDays": 90},
+    )
 
 
-def test_vpc_security_groups(app, dev_config):
+def test_vpc_security_groups(dev_template):
     """Test that security groups are created."""
-    stack = VpcStack(app, "TestVpcStack", dev_config)
-
-    template = assertions.Template.from_stack(stack)
-
     # Check that security groups are created
-    template.resource_count_is("AWS::EC2::SecurityGroup", 6)  # 5 custom + 1 default
+    dev_template.resource_count_is("AWS::EC2::SecurityGroup", 6)  # 5 custom + 1 default
 
 
-def test_vpc_flow_logs(app, dev_config):
-    """Test that VPC flow logs are created."""
-    stack = VpcStack(app, "TestVpcStack", dev_config)
-
-    template = assertions.Template.from_stack(stack)
-
+def test_vpc_flow_logs(dev_template):
+    """Test that VPC flow logs are created and delivered to S3 in dev."""
     # Check flow log is created
-    template.has_resource_properties(
+    dev_template.has_resource_properties(
         "AWS::EC2::FlowLog",
         {
             "ResourceType": "VPC",
             "TrafficType": "ALL",
+            "LogDestinationType": "s3",
         },
     )
 
+    # Check dev delivers to an expiring S3 bucket instead of CloudWatch Logs
+    dev_template.resource_count_is("AWS::Logs::LogGroup", 0)
+    dev_template.has_resource_properties(
+        "AWS::S3::Bucket",
+        {
+            "LifecycleConfiguration": {
+                "Rules": [assertions.Match.object_like({"ExpirationInDays": 7})]
+            },
+        },
+    )
 
-def test_vpc_subnets(app, dev_config):
-    """Test that subnets are created correctly."""
-    stack = VpcStack(app, "TestVpcStack", dev_config)
+    # Check the dev bucket is emptied and deleted on teardown
+    dev_template.has_resource("AWS::S3::Bucket", {"DeletionPolicy": "Delete"})
+    dev_template.resource_count_is("Custom::S3AutoDeleteObjects", 1)
 
-    template = assertions.Template.from_stack(stack)
 
+def test_vpc_subnets(dev_template):
+    """Test that subnets are created correctly."""
     # Check subnets are created
-    template.resource_count_is("AWS::EC2::Subnet", 6)  # 2 AZs * 3 subnet types
+    dev_template.resource_count_is("AWS::EC2::Subnet", 6)  # 2 AZs * 3 subnet types
 
     # Check public subnets
-    template.has_resource_properties(
+    dev_template.has_resource_properties(
         "AWS::EC2::Subnet",
         {
             "MapPublicIpOnLaunch": True,
@@ -86,13 +121,9 @@ def test_vpc_subnets(app, dev_config):
     )
 
 
-def test_ssm_parameters_created(app, dev_config):
+def test_ssm_parameters_created(dev_template):
     """Test that SSM parameters are created."""
-    stack = VpcStack(app, "TestVpcStack", dev_config)
-
-    template = assertions.Template.from_stack(stack)
-
     # Check SSM parameters are created
-    template.resource_count_is(
+    dev_template.resource_count_is(
         "AWS::SSM::Parameter", 10
     )  # VPC ID + 5 security group IDs + 4 subnet/AZ lists